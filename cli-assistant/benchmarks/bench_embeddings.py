@@ -0,0 +1,229 @@
+"""Speed, memory and parity of the ONNX embeddings backend against PyTorch.
+
+Each backend runs in its own subprocess so load time and peak RSS are
+measured separately; the parent compares the vectors:
+
+    python benchmarks/bench_embeddings.py --texts data/knowledge.txt --output parity.json
+    python benchmarks/bench_embeddings.py --onnx-model model.onnx --quantize
+
+Parity is the per-text cosine similarity between the two backends and
+the overlap of each text's nearest neighbours in both vector spaces.
+"""
+
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+import click
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from bench_knowledge import peak_rss_mb, percentile, write_corpus  # noqa: E402
+
+
+def load_texts(path: str, samples: int) -> List[str]:
+    """First ``samples`` knowledge chunks of a file."""
+    chunker = importlib.import_module("ngo-assisstant.services.chunker")
+    texts = []
+    for chunk in chunker.iter_chunks(path):
+        texts.append(chunk)
+        if len(texts) >= samples:
+            break
+    return texts
+
+
+def load_backend(backend: str, onnx_model: str, onnx_file: str):
+    """Build one embeddings backend the way KnowledgeService does."""
+    knowledge = importlib.import_module("ngo-assisstant.services.knowledge")
+    if backend == "torch":
+        HuggingFaceEmbeddings = knowledge._load_huggingface_embeddings()
+        return HuggingFaceEmbeddings(model_name=knowledge.EMBEDDING_MODEL)
+
+    service = knowledge.KnowledgeService(
+        {"onnx_model_path": onnx_model, "onnx_model_file": onnx_file}
+    )
+    return service._load_onnx_embeddings()
+
+
+def run_backend(
+    backend: str, texts: List[str], queries: int, onnx_model: str, onnx_file: str
+) -> Dict:
+    """Embed the texts with one backend in this process."""
+    start = time.perf_counter()
+    embeddings = load_backend(backend, onnx_model, onnx_file)
+    load = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectors = np.asarray(embeddings.embed_documents(texts), dtype=np.float32)
+    encode = time.perf_counter() - start
+
+    latencies = []
+    for text in texts[:queries]:
+        start = time.perf_counter()
+        embeddings.embed_query(text)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "backend": backend,
+        "model": getattr(embeddings, "model_file", None) or "all-MiniLM-L6-v2",
+        "load_s": round(load, 3),
+        "texts_per_s": round(len(texts) / encode, 1) if encode else None,
+        "query_p50_ms": round(percentile(latencies, 0.50), 3),
+        "query_p95_ms": round(percentile(latencies, 0.95), 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "vectors": vectors,
+    }
+
+
+def parity(reference: np.ndarray, candidate: np.ndarray, k: int) -> Dict:
+    """Cosine agreement and top-k neighbour overlap of two embeddings."""
+
+    def normalize(vectors):
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    reference, candidate = normalize(reference), normalize(candidate)
+    cosine = (reference * candidate).sum(axis=1)
+
+    k = min(k, len(reference) - 1)
+    overlaps = []
+    if k > 0:
+        for scores_ref, scores_cand in zip(
+            reference @ reference.T, candidate @ candidate.T
+        ):
+            top_ref = set(np.argsort(-scores_ref)[1 : k + 1])
+            top_cand = set(np.argsort(-scores_cand)[1 : k + 1])
+            overlaps.append(len(top_ref & top_cand) / k)
+
+    return {
+        "cosine_mean": round(float(cosine.mean()), 5),
+        "cosine_min": round(float(cosine.min()), 5),
+        "cosine_p05": round(float(np.percentile(cosine, 5)), 5),
+        f"top{k}_overlap": round(float(np.mean(overlaps)), 4) if overlaps else None,
+    }
+
+
+@click.command()
+@click.option("--texts", "texts_path", default=None, help="Knowledge file to sample")
+@click.option("--samples", default=1000, help="Chunks to embed")
+@click.option("--queries", default=200, help="Single-query latency samples")
+@click.option("--onnx-model", default="", help="Local .onnx file or directory")
+@click.option(
+    "--onnx-file", default="onnx/model_quint8_avx2.onnx", help="File in the model repo"
+)
+@click.option("--quantize", is_flag=True, help="Int8-quantize --onnx-model first")
+@click.option("--neighbours", default=10, help="k for neighbour overlap")
+@click.option("--output", "-o", default=None, help="Write the JSON report here")
+@click.option("--single", default=None, hidden=True)
+@click.option("--input", "input_path", default=None, hidden=True)
+def main(
+    texts_path,
+    samples,
+    queries,
+    onnx_model,
+    onnx_file,
+    quantize,
+    neighbours,
+    output,
+    single,
+    input_path,
+):
+    """Compare the ONNX embeddings backend with PyTorch."""
+    if single:
+        with open(input_path, "r", encoding="utf-8") as f:
+            texts = json.load(f)
+        result = run_backend(single, texts, queries, onnx_model, onnx_file)
+        np.save(output + ".npy", result.pop("vectors"))
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        if quantize:
+            onnx_embeddings = importlib.import_module(
+                "ngo-assisstant.services.onnx_embeddings"
+            )
+            if not onnx_model:
+                raise click.UsageError("--quantize needs --onnx-model")
+            target = os.path.splitext(onnx_model)[0] + "_int8.onnx"
+            onnx_model = onnx_embeddings.quantize_model(onnx_model, target)
+            click.echo(f"Quantized model written to {onnx_model}", err=True)
+
+        if not texts_path:
+            texts_path = os.path.join(workdir, "corpus.txt")
+            write_corpus(texts_path, samples * 1000, seed=7)
+        texts = load_texts(texts_path, samples)
+        input_path = os.path.join(workdir, "texts.json")
+        with open(input_path, "w", encoding="utf-8") as f:
+            json.dump(texts, f)
+
+        results = {}
+        for backend in ("torch", "onnx"):
+            result_path = os.path.join(workdir, f"{backend}.json")
+            subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    "--single",
+                    backend,
+                    "--input",
+                    input_path,
+                    "--queries",
+                    str(queries),
+                    "--onnx-model",
+                    onnx_model,
+                    "--onnx-file",
+                    onnx_file,
+                    "--output",
+                    result_path,
+                ],
+                check=True,
+                stdout=subprocess.DEVNULL,
+            )
+            with open(result_path, "r", encoding="utf-8") as f:
+                results[backend] = json.load(f)
+            results[backend]["vectors"] = np.load(result_path + ".npy")
+            click.echo(
+                json.dumps(
+                    {k: v for k, v in results[backend].items() if k != "vectors"}
+                ),
+                err=True,
+            )
+
+    torch_result, onnx_result = results["torch"], results["onnx"]
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "texts": len(texts),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "parity": parity(torch_result["vectors"], onnx_result["vectors"], neighbours),
+        "speedup": round(onnx_result["texts_per_s"] / torch_result["texts_per_s"], 2),
+        "memory_ratio": round(
+            onnx_result["peak_rss_mb"] / torch_result["peak_rss_mb"], 2
+        ),
+        "backends": {
+            name: {k: v for k, v in result.items() if k != "vectors"}
+            for name, result in results.items()
+        },
+    }
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    click.echo(text)
+
+
+if __name__ == "__main__":
+    main()
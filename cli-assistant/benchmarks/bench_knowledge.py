@@ -0,0 +1,223 @@
+"""Ingestion and search micro-benchmarks for KnowledgeService.
+
+Each corpus size runs in a fresh subprocess so peak RSS is per size:
+
+    python benchmarks/bench_knowledge.py --sizes 1MB,10MB,100MB --output baseline.json
+
+Embeddings come from a deterministic hash-seeded fake model and vectors
+live in the local NumPy store, so results measure the pipeline rather than
+the network or a GPU. Compare runs with the same ``--seed`` and sizes.
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+import click
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+UNITS = {"KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30}
+
+WORDS = (
+    "donor volunteer campaign village school health camp education fund "
+    "literacy teacher child program rural event gala report impact water "
+    "sanitation nutrition women livelihood training center medical book "
+    "scholarship tax exemption certificate partner corporate csr meeting"
+).split()
+
+
+class FakeEmbeddings:
+    """Deterministic embeddings seeded by a hash of the text.
+
+    Timing of every ``embed_documents`` call is recorded so batch
+    throughput can be reported.
+    """
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+        self.batches: List[tuple] = []
+
+    def _vector(self, text: str) -> np.ndarray:
+        seed = int.from_bytes(
+            hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little"
+        )
+        return np.random.default_rng(seed).standard_normal(self.dim, np.float32)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        start = time.perf_counter()
+        vectors = [self._vector(text) for text in texts]
+        self.batches.append((len(texts), time.perf_counter() - start))
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._vector(text)
+
+
+def parse_size(size: str) -> int:
+    """'10MB' -> 10485760."""
+    size = size.strip().upper()
+    for unit, factor in UNITS.items():
+        if size.endswith(unit):
+            return int(float(size[: -len(unit)]) * factor)
+    return int(size)
+
+
+def write_corpus(path: str, size: int, seed: int):
+    """Write ``size`` bytes of paragraph-structured synthetic text."""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(WORDS))]
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while written < size:
+            sentences = []
+            for _ in range(rng.randint(3, 8)):
+                words = rng.choices(WORDS, weights, k=rng.randint(6, 18))
+                sentences.append(" ".join(words).capitalize() + ".")
+            paragraph = " ".join(sentences) + "\n\n"
+            f.write(paragraph)
+            written += len(paragraph)
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Nearest-rank percentile of unsorted values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def run_size(size: int, queries: int, mode: str, seed: int) -> Dict:
+    """Ingest and query one synthetic corpus in this process."""
+    knowledge = importlib.import_module("ngo-assisstant.services.knowledge")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        corpus = os.path.join(workdir, "corpus.txt")
+        write_corpus(corpus, size, seed)
+
+        config = {
+            "vector_backend": "local",
+            "local_index_dir": os.path.join(workdir, "index"),
+            "local_index_mode": mode,
+            "knowledge_manifest": os.path.join(workdir, "manifest.json"),
+            "retriever_timeout": 600.0,
+        }
+        service = knowledge.KnowledgeService(config)
+        embeddings = FakeEmbeddings()
+        service.embeddings = embeddings
+        service._initialize_vector_store()
+
+        start = time.perf_counter()
+        service.load_from_file(corpus)
+        ingest = time.perf_counter() - start
+        chunks = service.bm25.count()
+
+        rng = random.Random(seed + 1)
+        latencies = []
+        for _ in range(queries):
+            query = " ".join(rng.sample(WORDS, rng.randint(2, 6)))
+            start = time.perf_counter()
+            service.search(query)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    embedded = sum(count for count, _ in embeddings.batches)
+    embed_time = sum(elapsed for _, elapsed in embeddings.batches)
+    return {
+        "size_bytes": size,
+        "chunks": chunks,
+        "ingest_s": round(ingest, 3),
+        "chunks_per_s": round(chunks / ingest, 1) if ingest else None,
+        "embed_batches": len(embeddings.batches),
+        "embed_texts_per_s": round(embedded / embed_time, 1) if embed_time else None,
+        "search_queries": queries,
+        "search_p50_ms": round(percentile(latencies, 0.50), 3),
+        "search_p95_ms": round(percentile(latencies, 0.95), 3),
+        "search_p99_ms": round(percentile(latencies, 0.99), 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+@click.command()
+@click.option("--sizes", default="1MB,10MB", help="Comma-separated corpus sizes")
+@click.option("--queries", default=200, help="Search queries per corpus")
+@click.option(
+    "--mode",
+    default="exact",
+    type=click.Choice(["exact", "ivf", "hnsw"]),
+    help="Local index search mode",
+)
+@click.option("--seed", default=7, help="Corpus and query seed")
+@click.option("--output", "-o", default=None, help="Write the JSON baseline here")
+@click.option("--single", default=None, hidden=True)
+def main(sizes, queries, mode, seed, output, single):
+    """Benchmark knowledge ingestion and search on synthetic corpora."""
+    if single:
+        result = run_size(int(single), queries, mode, seed)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        return
+
+    results = []
+    for size in [parse_size(s) for s in sizes.split(",") if s.strip()]:
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+            result_path = f.name
+        try:
+            subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    "--single",
+                    str(size),
+                    "--queries",
+                    str(queries),
+                    "--mode",
+                    mode,
+                    "--seed",
+                    str(seed),
+                    "--output",
+                    result_path,
+                ],
+                check=True,
+                stdout=subprocess.DEVNULL,
+            )
+            with open(result_path, "r", encoding="utf-8") as f:
+                results.append(json.load(f))
+        finally:
+            os.unlink(result_path)
+        click.echo(json.dumps(results[-1]), err=True)
+
+    baseline = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "mode": mode,
+            "seed": seed,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    text = json.dumps(baseline, indent=2)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    click.echo(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,10 +14,74 @@ class NGOConfig:
             'gemini_api_key': os.getenv('GEMINI_API_KEY'),
             'pinecone_api_key': os.getenv('PINECONE_API_KEY'),
             'pinecone_environment': os.getenv('PINECONE_ENVIRONMENT', 'us-west1-gcp-free'),
+            'pinecone_index': os.getenv('PINECONE_INDEX', 'ngo-knowledge-base'),
+            'knowledge_manifest': os.getenv('KNOWLEDGE_MANIFEST', 'data/.cache/knowledge_manifest.json'),
+            'bm25_index': os.getenv('BM25_INDEX', 'data/.cache/bm25_index.json'),
+            'embedding_cache_dir': os.getenv('EMBEDDING_CACHE_DIR', 'data/.cache/embeddings'),
+            'embedding_cache_size': int(os.getenv('EMBEDDING_CACHE_SIZE', 100000)),
+            'embedding_cache_dtype': os.getenv('EMBEDDING_CACHE_DTYPE', 'float16'),
+            'vector_backend': os.getenv('VECTOR_BACKEND', 'auto'),
+            'local_index_dir': os.getenv('LOCAL_INDEX_DIR', 'data/.cache/local_index'),
+            'local_index_mode': os.getenv('LOCAL_INDEX_MODE', 'exact'),
+            'local_index_nprobe': int(os.getenv('LOCAL_INDEX_NPROBE', 8)),
+            'hybrid_vector_weight': float(os.getenv('HYBRID_VECTOR_WEIGHT', 1.0)),
+            'hybrid_bm25_weight': float(os.getenv('HYBRID_BM25_WEIGHT', 1.0)),
+            'rrf_k': int(os.getenv('RRF_K', 60)),
+            'retriever_timeout': float(os.getenv('RETRIEVER_TIMEOUT', 2.0)),
+            'response_cache_path': os.getenv('RESPONSE_CACHE_PATH', 'data/.cache/response_cache.json'),
+            'response_cache_threshold': float(os.getenv('RESPONSE_CACHE_THRESHOLD', 0.92)),
+            'response_cache_ttl': float(os.getenv('RESPONSE_CACHE_TTL', 86400)),
+            'response_cache_size': int(os.getenv('RESPONSE_CACHE_SIZE', 500)),
             'email': os.getenv('EMAIL_ADDRESS'),
             'email_password': os.getenv('EMAIL_PASSWORD'),
             'smtp_server': os.getenv('SMTP_SERVER'),
             'smtp_port': int(os.getenv('SMTP_PORT', 587)),
+            'smtp_pool_size': int(os.getenv('SMTP_POOL_SIZE', 4)),
+            'smtp_max_messages': int(os.getenv('SMTP_MAX_MESSAGES', 100)),
+            'smtp_timeout': float(os.getenv('SMTP_TIMEOUT', 30)),
+            'email_rate': float(os.getenv('EMAIL_RATE', 5)),
+            'email_max_in_flight': int(os.getenv('EMAIL_MAX_IN_FLIGHT', 4)),
+            'email_domain_rates': os.getenv('EMAIL_DOMAIN_RATES', ''),
+            'email_max_attempts': int(os.getenv('EMAIL_MAX_ATTEMPTS', 3)),
+            'email_retry_backoff': float(os.getenv('EMAIL_RETRY_BACKOFF', 5)),
+            'campaign_dir': os.getenv('CAMPAIGN_DIR', 'data/.cache/campaigns'),
+            'journal_fsync_every': int(os.getenv('JOURNAL_FSYNC_EVERY', 100)),
+            'recipient_dedup': os.getenv('RECIPIENT_DEDUP', 'exact'),
+            'recipient_bloom_capacity': int(os.getenv('RECIPIENT_BLOOM_CAPACITY', 10000000)),
+            'recipient_db': os.getenv('RECIPIENT_DB', 'data/.cache/recipients.db'),
+            'merge_email_column': os.getenv('MERGE_EMAIL_COLUMN', 'email'),
+            'batch_concurrency': int(os.getenv('BATCH_CONCURRENCY', 4)),
+            'batch_size': int(os.getenv('BATCH_SIZE', 32)),
+            'history_size': int(os.getenv('HISTORY_SIZE', 50)),
+            'context_budget': int(os.getenv('CONTEXT_BUDGET', 1500)),
+            'context_history_share': float(os.getenv('CONTEXT_HISTORY_SHARE', 0.3)),
+            'context_recent_turns': int(os.getenv('CONTEXT_RECENT_TURNS', 2)),
+            'context_mmr_lambda': float(os.getenv('CONTEXT_MMR_LAMBDA', 0.7)),
+            'context_top_k': int(os.getenv('CONTEXT_TOP_K', 5)),
+            'reranker_model': os.getenv('RERANKER_MODEL', ''),
+            'rerank_candidates': int(os.getenv('RERANK_CANDIDATES', 20)),
+            'reranker_cache_size': int(os.getenv('RERANKER_CACHE_SIZE', 4096)),
+            'metrics_trace': os.getenv('METRICS_TRACE', ''),
+            'metrics_window': int(os.getenv('METRICS_WINDOW', 1000)),
+            'ingest_patterns': os.getenv('INGEST_PATTERNS', '*.md,*.txt'),
+            'ingest_workers': int(os.getenv('INGEST_WORKERS', 0)),
+            'embed_batch_size': int(os.getenv('EMBED_BATCH_SIZE', 256)),
+            'upsert_workers': int(os.getenv('UPSERT_WORKERS', 4)),
+            'chunk_buffer_size': int(os.getenv('CHUNK_BUFFER_SIZE', 1048576)),
+            'pinecone_upsert_batch': int(os.getenv('PINECONE_UPSERT_BATCH', 100)),
+            'daemon_socket': os.getenv('DAEMON_SOCKET', 'data/.cache/assistant.sock'),
+            'max_sessions': int(os.getenv('MAX_SESSIONS', 100)),
+            'answer_concurrency': int(os.getenv('ANSWER_CONCURRENCY', 16)),
+            'retriever_workers': int(os.getenv('RETRIEVER_WORKERS', 0)),
+            'embedding_backend': os.getenv('EMBEDDING_BACKEND', 'torch'),
+            'onnx_model_path': os.getenv('ONNX_MODEL_PATH', ''),
+            'onnx_model_file': os.getenv('ONNX_MODEL_FILE', 'onnx/model_quint8_avx2.onnx'),
+            'onnx_threads': int(os.getenv('ONNX_THREADS', 0)),
+            'completion_cache_path': os.getenv('COMPLETION_CACHE_PATH', 'data/.cache/completions.db'),
+            'completion_cache_mode': os.getenv('COMPLETION_CACHE_MODE', 'cache'),
+            'completion_replay_path': os.getenv('COMPLETION_REPLAY_PATH', 'data/.cache/completions-replay.db'),
+            'completion_cache_ttl': float(os.getenv('COMPLETION_CACHE_TTL', 86400)),
+            'completion_cache_mb': float(os.getenv('COMPLETION_CACHE_MB', 64)),
         }
         self._validate_config()
     
@@ -27,7 +91,7 @@ class NGOConfig:
         
         if not self.config['gemini_api_key']:
             missing_vars.append('GEMINI_API_KEY')
-        if not self.config['pinecone_api_key']:
+        if not self.config['pinecone_api_key'] and self.config['vector_backend'] == 'pinecone':
             missing_vars.append('PINECONE_API_KEY')
             
         if missing_vars:
@@ -1,32 +1,324 @@
+import asyncio
+import contextvars
+import hashlib
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 from rich.console import Console
 from rich.table import Table
+from rich.live import Live
 from rich.panel import Panel
 from rich.prompt import Prompt
+from rich.text import Text
+from .context import ContextBuilder, count_tokens
+from .warmup import Warmup
 from ..services.knowledge import KnowledgeService
 from ..services.email import EmailService
 from ..utils.helpers import EmailHandler
+from ..utils.metrics import Metrics
 
-try:
-    from langchain_google_genai import ChatGoogleGenerativeAI
-except ImportError:
-    ChatGoogleGenerativeAI = None
+if TYPE_CHECKING:
+    from langchain.schema import Document
 
 console = Console()
 
+LLM_UNAVAILABLE = "AI model not available. Please set GEMINI_API_KEY in your .env file."
+LLM_MODEL = "gemini-1.5-flash"
+LLM_TEMPERATURE = 0.7
+
+CHAT_COMMANDS = [
+    ("help", "Show this help message"),
+    ("send mail", "Send emails to recipients"),
+    ("resume", "Resume an interrupted email campaign"),
+    ("unsubscribe", "Exclude an address from future campaigns"),
+    ("history", "Show conversation history"),
+    ("status", "Show system status"),
+    ("quit/exit", "Exit the CLI application"),
+]
+
+
+def show_help():
+    """Show available commands."""
+    help_table = Table(title="Available Commands")
+    help_table.add_column("Command", style="cyan")
+    help_table.add_column("Description", style="white")
+
+    for cmd, desc in CHAT_COMMANDS:
+        help_table.add_row(cmd, desc)
+
+    console.print(help_table)
+
+
+def show_history(entries: List[Dict]):
+    """Show the last few turns of a conversation."""
+    if not entries:
+        console.print("[yellow]No conversation history.[/yellow]")
+        return
+
+    for entry in entries[-5:]:
+        timestamp = entry.get("timestamp", "")
+        console.print(f"[dim]{timestamp}[/dim]")
+        console.print(f"[cyan]You:[/cyan] {entry.get('user', '')}")
+        console.print(f"[blue]Assistant:[/blue] {entry.get('assistant', '')[:100]}...")
+        console.print("-" * 50)
+
+
+def show_status(rows: List[Tuple[str, str]]):
+    """Show the component status table."""
+    status_table = Table(title="System Status")
+    status_table.add_column("Component", style="cyan")
+    status_table.add_column("Status", style="white")
+
+    for component, status in rows:
+        status_table.add_row(component, status)
+
+    console.print(status_table)
+
+
+def show_latency(summary: Dict[str, Dict[str, float]], counters: Dict[str, float]):
+    """Show per-stage latency histograms and token/cache counters."""
+    if not summary:
+        return
+
+    latency_table = Table(title="Latency by Stage")
+    latency_table.add_column("Stage", style="cyan")
+    latency_table.add_column("Count", style="white", justify="right")
+    latency_table.add_column("p50", style="white", justify="right")
+    latency_table.add_column("p95", style="white", justify="right")
+    latency_table.add_column("Max", style="white", justify="right")
+    for stage, stats in summary.items():
+        latency_table.add_row(
+            stage,
+            str(stats["count"]),
+            f"{stats['p50_ms']:.1f} ms",
+            f"{stats['p95_ms']:.1f} ms",
+            f"{stats['max_ms']:.1f} ms",
+        )
+    console.print(latency_table)
+
+    requests = sum(
+        summary[kind]["count"]
+        for kind in ("generate", "stream", "batch", "answer")
+        if kind in summary
+    )
+    if requests:
+        console.print(
+            f"[dim]Tokens: {counters.get('prompt_tokens', 0)} prompt · "
+            f"{counters.get('completion_tokens', 0)} completion · "
+            f"answer cache hits {counters.get('cache_hit', 0)}/{requests}[/dim]"
+        )
+
+
+def render_stream(stream: Iterator[str]) -> str:
+    """Render a streamed response live and report latency."""
+    start = time.perf_counter()
+
+    with console.status("[bold green]Thinking...", spinner="dots"):
+        parts = [next(stream, "")]
+    first_token = time.perf_counter() - start
+
+    console.print()
+    label = ("🤖 Assistant: ", "bold blue")
+    with Live(
+        Text.assemble(label, parts[0]),
+        console=console,
+        refresh_per_second=12,
+        vertical_overflow="visible",
+    ) as live:
+        for text in stream:
+            parts.append(text)
+            live.update(Text.assemble(label, "".join(parts)))
+
+    total = time.perf_counter() - start
+    console.print(f"[dim]⏱  first token {first_token:.2f}s · total {total:.2f}s[/dim]")
+    return "".join(parts)
+
+
+def run_chat(
+    intro: str,
+    email_handler: Callable[[], EmailHandler],
+    ask: Callable[[str], None],
+    history: Callable[[], None],
+    status: Callable[[], None],
+    on_error: Optional[Callable[[Exception], bool]] = None,
+):
+    """Chat loop shared by the in-process agent and the daemon client.
+
+    ``on_error`` handles a failed command and returns True to end the chat;
+    by default errors are printed and the loop continues.
+    """
+    console.print(
+        Panel.fit(
+            "[bold green]🌟 Welcome to Sankalpiq's Campaign Assistant![/bold green]\n"
+            f"{intro}\n"
+            "Type 'help' for commands, 'quit' to exit.",
+            title="NGO Assistant",
+            border_style="green",
+        )
+    )
+
+    while True:
+        try:
+            user_input = Prompt.ask("\n[bold cyan]You[/bold cyan]").strip()
+            command = user_input.lower()
+
+            if command in ["quit", "exit", "bye"]:
+                console.print("[green]👋 Goodbye![/green]")
+                break
+
+            elif command == "help":
+                show_help()
+
+            elif command in ["resume", "resume campaign"]:
+                email_handler().resume_campaign()
+
+            elif command in ["unsubscribe", "suppress"]:
+                email_handler().unsubscribe()
+
+            elif any(word in command for word in ["send mail", "email"]):
+                email_handler().handle_email_request()
+
+            elif command == "history":
+                history()
+
+            elif command == "status":
+                status()
+
+            elif user_input:
+                ask(user_input)
+
+        except KeyboardInterrupt:
+            console.print("\n[yellow]Use 'quit' to exit.[/yellow]")
+        except Exception as e:
+            if on_error is not None:
+                if on_error(e):
+                    break
+            else:
+                console.print(f"[red]❌ Error: {e}[/red]")
+
 
 class NGOAgent:
 
     def __init__(self, config):
         self.config = config
-        self.knowledge_service = KnowledgeService(config)
+        self.metrics = Metrics(
+            trace_path=config.get("metrics_trace") or None,
+            window=config.get("metrics_window", 1000),
+        )
+        self.knowledge_service = KnowledgeService(config, self.metrics)
         self.email_service = EmailService(config)
         self.email_handler = EmailHandler(self.email_service)
-        self.llm = self._initialize_llm()
-        self.conversation_history = []
+        self.llm = None
+        self.response_cache = None
+        self.conversation_history = deque(maxlen=config.get("history_size", 50))
+        self.sessions: "OrderedDict[str, deque]" = OrderedDict()
+        self._sessions_lock = threading.Lock()
+        self._answer_slots: Optional[asyncio.Semaphore] = None
+        self._answer_pool: Optional[ThreadPoolExecutor] = None
+        self.context_builder = ContextBuilder(
+            budget=config.get("context_budget", 1500),
+            history_share=config.get("context_history_share", 0.3),
+            recent_turns=config.get("context_recent_turns", 2),
+            mmr_lambda=config.get("context_mmr_lambda", 0.7),
+        )
+        self._startup_knowledge = (None, False)
+        self.warmup = Warmup(
+            self.knowledge_service.warmup_steps()
+            + [
+                ("Gemini LLM", self._start_llm),
+                ("answer cache", self._start_response_cache),
+                ("knowledge file", self._load_startup_knowledge),
+            ]
+        )
+
+    def start_warmup(self, knowledge_file: str = None, reindex: bool = False):
+        """Begin loading models, index and knowledge in the background."""
+        self._startup_knowledge = (knowledge_file, reindex)
+        self.warmup.start()
+
+    def ensure_ready(self):
+        """Block until background warm-up has finished."""
+        self.warmup.wait()
+
+    def _start_llm(self):
+        """Warm-up step: connect the LLM behind the completion cache."""
+        mode = self.config.get("completion_cache_mode", "cache")
+        llm = None if mode == "replay" else self._initialize_llm()
+        self.llm = self._wrap_completion_cache(llm, mode)
+
+    def _wrap_completion_cache(self, llm, mode: str):
+        """Serve repeated prompts from disk; in replay mode never call the LLM.
+
+        ``record`` and ``replay`` use their own database without expiry or
+        eviction, so normal cached runs never drop recorded completions.
+        """
+        if mode in ("record", "replay"):
+            path = self.config.get("completion_replay_path")
+            ttl, max_bytes = None, None
+        else:
+            path = self.config.get("completion_cache_path")
+            ttl = self.config.get("completion_cache_ttl", 86400)
+            max_bytes = int(self.config.get("completion_cache_mb", 64) * (1 << 20))
+        if mode == "off" or not path or (llm is None and mode != "replay"):
+            return llm
+
+        try:
+            from ..services.completion_cache import CachedLLM, CompletionCache
+
+            cache = CompletionCache(
+                path, ttl=ttl, max_bytes=max_bytes, replay=mode == "replay"
+            )
+        except Exception as e:
+            console.print(f"[yellow]⚠️  Completion cache disabled: {e}[/yellow]")
+            return llm
+
+        if mode == "replay":
+            console.print("[cyan]⏯  Replaying recorded completions, LLM offline[/cyan]")
+        return CachedLLM(
+            llm,
+            cache,
+            {"model": LLM_MODEL, "temperature": LLM_TEMPERATURE},
+            self.metrics,
+        )
+
+    def _start_response_cache(self):
+        """Warm-up step: open the answer cache (needs embeddings)."""
+        self.response_cache = self._initialize_response_cache()
+
+    def _load_startup_knowledge(self):
+        """Load the knowledge file given on the command line."""
+        knowledge_file, reindex = self._startup_knowledge
+        if not knowledge_file:
+            return
+
+        if self.knowledge_service.load_path(
+            knowledge_file, reindex=reindex, show_progress=False
+        ):
+            console.print(f"[cyan]📚 Knowledge loaded from {knowledge_file}[/cyan]")
+        else:
+            console.print(
+                f"[yellow]💡 Create {knowledge_file} to add NGO-specific knowledge[/yellow]"
+            )
 
     def _initialize_llm(self):
         """Initialize Gemini LLM."""
+        try:
+            from langchain_google_genai import ChatGoogleGenerativeAI
+        except ImportError:
+            ChatGoogleGenerativeAI = None
+
         api_key = self.config.get("gemini_api_key")
         if not api_key or not ChatGoogleGenerativeAI:
             console.print("[red]❌ AI features disabled[/red]")
@@ -34,7 +326,7 @@ class NGOAgent:
 
         try:
             llm = ChatGoogleGenerativeAI(
-                model="gemini-1.5-flash", google_api_key=api_key, temperature=0.7
+                model=LLM_MODEL, google_api_key=api_key, temperature=LLM_TEMPERATURE
             )
             console.print("[green]✅ AI initialized[/green]")
             return llm
@@ -42,144 +334,394 @@ class NGOAgent:
             console.print(f"[red]❌ AI initialization failed: {e}[/red]")
             return None
 
-    def load_knowledge(self, file_path: str) -> bool:
+    def _initialize_response_cache(self):
+        """Initialize the semantic answer cache."""
+        path = self.config.get("response_cache_path")
+        if not path or not self.knowledge_service.embeddings:
+            return None
+
+        from ..services.response_cache import SemanticResponseCache
+
+        return SemanticResponseCache(
+            path,
+            threshold=self.config.get("response_cache_threshold", 0.92),
+            ttl=self.config.get("response_cache_ttl", 86400),
+            max_entries=self.config.get("response_cache_size", 500),
+        )
+
+    def session_history(self, session_id: Optional[str] = None) -> deque:
+        """Conversation history of a session; None is the local chat.
+
+        Only the ``max_sessions`` most recently used sessions are kept.
+        """
+        if session_id is None:
+            return self.conversation_history
+
+        with self._sessions_lock:
+            history = self.sessions.get(session_id)
+            if history is None:
+                history = deque(maxlen=self.config.get("history_size", 50))
+                self.sessions[session_id] = history
+            self.sessions.move_to_end(session_id)
+            while len(self.sessions) > self.config.get("max_sessions", 100):
+                self.sessions.popitem(last=False)
+            return history
+
+    def record_turn(
+        self, user_input: str, response: str, session_id: Optional[str] = None
+    ):
+        """Append a finished exchange to a session's history."""
+        self.session_history(session_id).append(
+            {
+                "timestamp": datetime.now().isoformat(),
+                "user": user_input,
+                "assistant": response,
+            }
+        )
+
+    def load_knowledge(self, file_path: str, reindex: bool = False) -> bool:
         """Load knowledge base from file."""
-        return self.knowledge_service.load_from_file(file_path)
+        self.ensure_ready()
+        return self.knowledge_service.load_path(file_path, reindex=reindex)
 
-    def generate_response(self, user_input: str) -> str:
+    def generate_response(
+        self, user_input: str, session_id: Optional[str] = None
+    ) -> str:
         """Generate AI response with knowledge context."""
+        self.ensure_ready()
         if not self.llm:
-            return (
-                "AI model not available. Please set GEMINI_API_KEY in your .env file."
+            return LLM_UNAVAILABLE
+
+        with self.metrics.request("generate"):
+            history = self.session_history(session_id)
+            history_key = self._history_key(history)
+            query_vector, cached = self._cached_answer(
+                user_input, history_key=history_key
             )
+            if cached is not None:
+                return cached
 
-        # Get relevant context
-        context = self.knowledge_service.search(user_input)
-        context_str = "\n".join(context) if context else ""
+            prompt = self._build_prompt(
+                user_input, query_vector=query_vector, history=history
+            )
+            try:
+                with self.metrics.stage("llm"):
+                    response = self.llm.invoke(prompt)
+            except Exception as e:
+                return f"Sorry, I encountered an error: {e}"
 
-        system_prompt = f"""You are an AI assistant for an NGO. You help with:
+            self._record_tokens(prompt, response.content, response)
+            self._remember_answer(
+                user_input, query_vector, response.content, history_key
+            )
+            return response.content
+
+    def answer_with_sources(
+        self,
+        question: str,
+        query_vector: Optional[List[float]] = None,
+        sources_on_hit: bool = False,
+    ) -> Tuple[str, List["Document"], bool]:
+        """Answer one question; returns (answer, context documents, cached).
+
+        The answer cache is checked before retrieval. A cached answer comes
+        back without documents unless ``sources_on_hit`` is set. Unlike
+        generate_response, LLM errors are raised to the caller.
+        """
+        self.ensure_ready()
+        if not self.llm:
+            raise RuntimeError(LLM_UNAVAILABLE)
+
+        with self.metrics.request("batch"):
+            query_vector, cached = self._cached_answer(question, query_vector)
+            if cached is not None and not sources_on_hit:
+                return cached, [], True
+
+            documents = self.knowledge_service.search_documents(
+                question, self.config.get("context_top_k", 5), query_vector=query_vector
+            )
+            if cached is not None:
+                return cached, documents, True
+
+            context = [doc.page_content for doc in documents]
+            prompt = self._build_prompt(question, context, history=())
+            with self.metrics.stage("llm"):
+                response = self.llm.invoke(prompt)
+
+            self._record_tokens(prompt, response.content, response)
+            self._remember_answer(question, query_vector, response.content)
+            return response.content, documents, False
+
+    async def answer(self, query: str, session_id: Optional[str] = None) -> str:
+        """Answer a question without blocking the event loop or touching the UI.
+
+        Retrieval, prompt building and cache I/O run on a worker thread and
+        the LLM is awaited with ``ainvoke``. At most ``answer_concurrency``
+        questions are in flight; the rest wait their turn. With a
+        ``session_id`` the prompt includes that session's history and the
+        exchange is added to it; without one the question stands alone.
+        LLM errors are raised to the caller.
+        """
+        await self._offload(self.ensure_ready)
+        if not self.llm:
+            raise RuntimeError(LLM_UNAVAILABLE)
+
+        if self._answer_slots is None:
+            self._answer_slots = asyncio.Semaphore(
+                self.config.get("answer_concurrency", 16)
+            )
+
+        async with self._answer_slots:
+            with self.metrics.request("answer"):
+                history = (
+                    self.session_history(session_id) if session_id is not None else ()
+                )
+                history_key = self._history_key(history)
+                query_vector, cached = await self._offload(
+                    self._cached_answer, query, None, history_key
+                )
+                if cached is not None:
+                    answer = cached
+                else:
+                    prompt = await self._offload(
+                        self._build_prompt, query, None, query_vector, history
+                    )
+                    with self.metrics.stage("llm"):
+                        response = await self.llm.ainvoke(prompt)
+                    answer = response.content
+
+                    self._record_tokens(prompt, answer, response)
+                    await self._offload(
+                        self._remember_answer, query, query_vector, answer, history_key
+                    )
+
+        if session_id is not None:
+            self.record_turn(query, answer, session_id)
+        return answer
+
+    async def _offload(self, fn, *args):
+        """Run blocking work on the answer thread pool, keeping the trace."""
+        if self._answer_pool is None:
+            self._answer_pool = ThreadPoolExecutor(
+                max_workers=self.config.get("answer_concurrency", 16),
+                thread_name_prefix="answer",
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._answer_pool, contextvars.copy_context().run, fn, *args
+        )
+
+    def stream_response(
+        self, user_input: str, session_id: Optional[str] = None
+    ) -> Iterator[str]:
+        """Yield the AI response in pieces as the LLM produces them."""
+        self.ensure_ready()
+        if not self.llm:
+            yield LLM_UNAVAILABLE
+            return
+
+        with self.metrics.request("stream"):
+            history = self.session_history(session_id)
+            history_key = self._history_key(history)
+            query_vector, cached = self._cached_answer(
+                user_input, history_key=history_key
+            )
+            if cached is not None:
+                yield cached
+                return
+
+            prompt = self._build_prompt(
+                user_input, query_vector=query_vector, history=history
+            )
+            parts = []
+            start = time.perf_counter()
+            try:
+                for chunk in self.llm.stream(prompt):
+                    if chunk.content:
+                        if not parts:
+                            self.metrics.observe(
+                                "first_token", time.perf_counter() - start
+                            )
+                        parts.append(chunk.content)
+                        yield chunk.content
+            except Exception as e:
+                yield f"Sorry, I encountered an error: {e}"
+                return
+            finally:
+                self.metrics.observe("llm", time.perf_counter() - start)
+
+            self._record_tokens(prompt, "".join(parts))
+            self._remember_answer(user_input, query_vector, "".join(parts), history_key)
+
+    def _build_prompt(
+        self,
+        user_input: str,
+        context: List[str] = None,
+        query_vector=None,
+        history: Optional[Iterable[Dict]] = None,
+    ) -> str:
+        """Build the LLM prompt with budgeted knowledge context and history."""
+        if context is None:
+            documents = self.knowledge_service.search_documents(
+                user_input,
+                self.config.get("context_top_k", 5),
+                query_vector=query_vector,
+            )
+            context = [doc.page_content for doc in documents]
+
+        with self.metrics.stage("build_prompt"):
+            context_str, history_str = self.context_builder.build(
+                context, self.conversation_history if history is None else history
+            )
+        history_section = f"Conversation so far:\n{history_str}" if history_str else ""
+
+        return f"""You are an AI assistant for an NGO. You help with:
 1. Campaign planning and strategy
 2. Donation drive organization  
 3. Email communication
 4. Event planning
 5. Volunteer management
 
+{history_section}
+
 {f"Relevant context: {context_str}" if context_str else ""}
 
 Query: {user_input}
 
 Provide a helpful, professional response."""
 
-        try:
-            response = self.llm.invoke(system_prompt)
-            return response.content
-        except Exception as e:
-            return f"Sorry, I encountered an error: {e}"
-
-    def start_chat(self):
-        """Main chat interface."""
-        console.print(
-            Panel.fit(
-                "[bold green]🌟 Welcome to Sankalpiq's Campaign Assistant![/bold green]\n"
-                "I can help with campaigns, donations, and email management.\n"
-                "Type 'help' for commands, 'quit' to exit.",
-                title="NGO Assistant",
-                border_style="green",
+    def _history_key(self, history: Optional[Iterable[Dict]]) -> str:
+        """Digest of the history block a prompt will carry ("" for none).
+
+        Answers are cached per history block, so a follow-up reuses an
+        answer only after the same recent turns.
+        """
+        text = self.context_builder.history_text(history)
+        if not text:
+            return ""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+    def _cached_answer(self, user_input: str, query_vector=None, history_key=""):
+        """Return (query_vector, cached_answer) from the answer cache."""
+        if not self.response_cache:
+            return query_vector, None
+
+        if query_vector is None:
+            query_vector = self._embed_query(user_input)
+        if query_vector is None:
+            return None, None
+
+        with self.metrics.stage("cache_lookup"):
+            cached = self.response_cache.lookup(
+                query_vector, self.knowledge_service.kb_version, history_key
             )
+        self.metrics.mark(cache_hit=cached is not None)
+        return query_vector, cached
+
+    def _record_tokens(self, prompt: str, completion: str, response=None):
+        """Attach prompt/completion token counts to the current request."""
+        usage = getattr(response, "usage_metadata", None) or {}
+        self.metrics.mark(
+            prompt_tokens=usage.get("input_tokens") or count_tokens(prompt),
+            completion_tokens=usage.get("output_tokens") or count_tokens(completion),
         )
 
-        while True:
-            try:
-                user_input = Prompt.ask("\n[bold cyan]You[/bold cyan]").strip()
-
-                if user_input.lower() in ["quit", "exit", "bye"]:
-                    console.print("[green]👋 Goodbye![/green]")
-                    break
-
-                elif user_input.lower() == "help":
-                    self._show_help()
-
-                elif any(word in user_input.lower() for word in ["send mail", "email"]):
-                    self.email_handler.handle_email_request()
-
-                elif user_input.lower() == "history":
-                    self._show_history()
-
-                elif user_input.lower() == "status":
-                    self._show_status()
+    def _remember_answer(
+        self, user_input: str, query_vector, answer: str, history_key: str = ""
+    ):
+        """Store a fresh answer in the answer cache."""
+        if not self.response_cache or query_vector is None or not answer:
+            return
 
-                else:
-                    with console.status("[bold green]Thinking...", spinner="dots"):
-                        response = self.generate_response(user_input)
+        self.response_cache.store(
+            user_input,
+            query_vector,
+            answer,
+            self.knowledge_service.kb_version,
+            history_key,
+        )
 
-                    console.print(f"\n[bold blue]🤖 Assistant:[/bold blue] {response}")
+    def _embed_query(self, user_input: str):
+        """Embed the query for the answer cache; None when caching is off."""
+        if not self.response_cache:
+            return None
 
-                    self.conversation_history.append(
-                        {
-                            "timestamp": datetime.now().isoformat(),
-                            "user": user_input,
-                            "assistant": response,
-                        }
-                    )
+        try:
+            with self.metrics.stage("embed_query"):
+                return self.knowledge_service.embeddings.embed_query(user_input)
+        except Exception as e:
+            console.print(f"[yellow]⚠️  Answer cache skipped: {e}[/yellow]")
+            return None
 
-            except KeyboardInterrupt:
-                console.print("\n[yellow]Use 'quit' to exit.[/yellow]")
-            except Exception as e:
-                console.print(f"[red]❌ Error: {e}[/red]")
+    def start_chat(self):
+        """Main chat interface."""
+        run_chat(
+            "I can help with campaigns, donations, and email management.",
+            lambda: self.email_handler,
+            self._ask,
+            self._show_history,
+            self._show_status,
+        )
 
-    def _show_help(self):
-        """Show available commands."""
-        help_table = Table(title="Available Commands")
-        help_table.add_column("Command", style="cyan")
-        help_table.add_column("Description", style="white")
-
-        commands = [
-            ("help", "Show this help message"),
-            ("send mail", "Send emails to recipients"),
-            ("history", "Show conversation history"),
-            ("status", "Show system status"),
-            ("quit/exit", "Exit the CLI application"),
-        ]
+    def _ask(self, user_input: str):
+        """Answer one chat message and remember the turn."""
+        response = self._stream_to_console(user_input)
+        self.record_turn(user_input, response)
 
-        for cmd, desc in commands:
-            help_table.add_row(cmd, desc)
+    def _stream_to_console(self, user_input: str) -> str:
+        """Render a streamed response live and report latency."""
+        if not self.warmup.done:
+            with console.status("[bold green]Warming up...", spinner="dots"):
+                self.ensure_ready()
 
-        console.print(help_table)
+        return render_stream(self.stream_response(user_input))
 
     def _show_history(self):
         """Show recent conversation history."""
-        if not self.conversation_history:
-            console.print("[yellow]No conversation history.[/yellow]")
-            return
-
-        for entry in self.conversation_history[-5:]:
-            timestamp = entry.get("timestamp", "")
-            console.print(f"[dim]{timestamp}[/dim]")
-            console.print(f"[cyan]You:[/cyan] {entry.get('user', '')}")
-            console.print(
-                f"[blue]Assistant:[/blue] {entry.get('assistant', '')[:100]}..."
-            )
-            console.print("-" * 50)
+        show_history(list(self.conversation_history))
 
     def _show_status(self):
         """Show system status."""
-        status_table = Table(title="System Status")
-        status_table.add_column("Component", style="cyan")
-        status_table.add_column("Status", style="white")
+        show_status(self.status_rows())
+        if self.warmup.done:
+            show_latency(self.metrics.summary(), self.metrics.counters)
 
-        components = [
+    def status_rows(self) -> List[Tuple[str, str]]:
+        """(component, status) rows for the status table."""
+        if not self.warmup.done:
+            return [("Warm-up", self.warmup.describe())]
+
+        return [
+            ("Warm-up", self.warmup.describe()),
             ("AI (Gemini)", "✅ Ready" if self.llm else "❌ Disabled"),
             (
                 "Knowledge Base",
-                "✅ Ready" if self.knowledge_service.vector_store else "❌ Disabled",
+                (
+                    f"✅ Ready ({self.knowledge_service.backend})"
+                    if self.knowledge_service.vector_store
+                    else "❌ Disabled"
+                ),
             ),
             (
                 "Email Service",
                 "✅ Ready" if self.config.get("email") else "❌ Not configured",
             ),
+            ("Answer Cache", self._cache_status(self.response_cache)),
+            ("Completion Cache", self._cache_status(self.llm)),
+            ("Embedding Cache", self._cache_status(self.knowledge_service.embeddings)),
+            ("Re-ranker", self._cache_status(self.knowledge_service.reranker)),
         ]
 
-        for component, status in components:
-            status_table.add_row(component, status)
-
-        console.print(status_table)
+    @staticmethod
+    def _cache_status(cache) -> str:
+        """One-line hit-rate summary for a cache exposing stats()."""
+        if not hasattr(cache, "stats"):
+            return "❌ Disabled"
+
+        stats = cache.stats()
+        lookups = stats["hits"] + stats["misses"]
+        rate = stats["hits"] / lookups if lookups else 0.0
+        return (
+            f"✅ {stats['entries']} entries, "
+            f"{stats['hits']}/{lookups} hits ({rate:.0%})"
+        )
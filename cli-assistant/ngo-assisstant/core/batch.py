@@ -0,0 +1,165 @@
+import csv
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Iterator, List, Set, Tuple
+from rich.console import Console
+from rich.progress import Progress
+from ..services.manifest import chunk_id
+
+console = Console()
+
+
+def iter_questions(path: str) -> Iterator[Tuple[int, str]]:
+    """Yield (row number, question) from a text file or a CSV.
+
+    CSV files use their ``question`` column, or the first column.
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if not path.lower().endswith(".csv"):
+            for number, line in enumerate(f):
+                if line.strip():
+                    yield number, line.strip()
+            return
+
+        reader = csv.reader(f)
+        header = next(reader, [])
+        lowered = [column.strip().lower() for column in header]
+        column = lowered.index("question") if "question" in lowered else 0
+        for number, row in enumerate(reader, 1):
+            if len(row) > column and row[column].strip():
+                yield number, row[column].strip()
+
+
+def completed_ids(output_path: str) -> Set[int]:
+    """Question ids already answered in an existing output file."""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not record.get("error"):
+                done.add(record["id"])
+    return done
+
+
+class BatchRunner:
+    """Answers a file of questions offline with bounded concurrency.
+
+    Questions are embedded ``batch_size`` at a time, then retrieval and the
+    LLM call run on ``concurrency`` worker threads. Each result is appended
+    to the JSONL output as it completes; rerunning with the same output
+    skips questions that were already answered without error. Answers
+    served from the answer cache skip retrieval and have no
+    ``context_ids`` unless ``cached_sources`` is set.
+    """
+
+    def __init__(
+        self,
+        agent,
+        concurrency: int = 4,
+        batch_size: int = 32,
+        cached_sources: bool = False,
+    ):
+        self.agent = agent
+        self.concurrency = max(1, concurrency)
+        self.batch_size = max(1, batch_size)
+        self.cached_sources = cached_sources
+        self._lock = threading.Lock()
+
+    def run(self, questions_path: str, output_path: str) -> Dict:
+        """Answer every pending question and return run statistics."""
+        self.agent.ensure_ready()
+
+        done = completed_ids(output_path)
+        pending = [
+            item for item in iter_questions(questions_path) if item[0] not in done
+        ]
+        stats = {"answered": 0, "cached": 0, "failed": 0, "skipped": len(done)}
+        latencies: List[float] = []
+
+        if not pending:
+            console.print("[green]✅ All questions already answered.[/green]")
+            return stats
+
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        started = time.perf_counter()
+        with open(output_path, "a", encoding="utf-8") as out, Progress(
+            console=console
+        ) as progress, ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="batch"
+        ) as executor:
+            task = progress.add_task("Answering", total=len(pending))
+            in_flight = threading.BoundedSemaphore(self.concurrency * 2)
+
+            def finish(future):
+                in_flight.release()
+                record = future.result()
+                with self._lock:
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    out.flush()
+                    if record.get("error"):
+                        stats["failed"] += 1
+                    else:
+                        stats["answered"] += 1
+                        stats["cached"] += record["cached"]
+                        latencies.append(record["latency_ms"])
+                progress.advance(task)
+
+            items = iter(pending)
+            while True:
+                batch = list(islice(items, self.batch_size))
+                if not batch:
+                    break
+                vectors = self._embed([question for _, question in batch])
+                for (number, question), vector in zip(batch, vectors):
+                    in_flight.acquire()
+                    executor.submit(
+                        self._answer, number, question, vector
+                    ).add_done_callback(finish)
+
+        elapsed = time.perf_counter() - started
+        stats["elapsed"] = elapsed
+        stats["throughput"] = (stats["answered"] + stats["failed"]) / elapsed
+        if latencies:
+            ordered = sorted(latencies)
+            stats["p50_ms"] = ordered[len(ordered) // 2]
+            stats["p95_ms"] = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+        return stats
+
+    def _embed(self, questions: List[str]) -> List:
+        """One embedding call per batch; falls back to per-query embedding."""
+        try:
+            vectors = self.agent.knowledge_service.embed_queries(questions)
+        except Exception as e:
+            console.print(f"[yellow]⚠️  Batch embedding failed: {e}[/yellow]")
+            vectors = None
+        return vectors if vectors is not None else [None] * len(questions)
+
+    def _answer(self, number: int, question: str, vector) -> Dict:
+        """Answer one question and build its output record."""
+        start = time.perf_counter()
+        record = {"id": number, "question": question}
+        try:
+            answer, documents, cached = self.agent.answer_with_sources(
+                question, vector, sources_on_hit=self.cached_sources
+            )
+        except Exception as e:
+            record["error"] = str(e)
+            return record
+
+        record.update(
+            answer=answer,
+            context_ids=[chunk_id(doc.page_content) for doc in documents],
+            cached=cached,
+            latency_ms=round((time.perf_counter() - start) * 1000, 1),
+        )
+        return record
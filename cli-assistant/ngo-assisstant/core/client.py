@@ -0,0 +1,166 @@
+import json
+import socket
+import uuid
+from typing import Dict, Iterator, Optional
+from rich.console import Console
+
+console = Console()
+
+
+class DaemonError(RuntimeError):
+    """The assistant daemon is unreachable or rejected a request."""
+
+
+def daemon_available(socket_path: str, timeout: float = 0.5) -> bool:
+    """Whether a daemon answers on the socket."""
+    try:
+        with DaemonClient(socket_path, timeout=timeout) as client:
+            return client.call("ping")["type"] == "pong"
+    except (OSError, DaemonError):
+        return False
+
+
+class DaemonClient:
+    """Thin client for AssistantDaemon over one Unix socket connection."""
+
+    def __init__(
+        self,
+        socket_path: str,
+        session: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.socket_path = socket_path
+        self.session = session or uuid.uuid4().hex[:12]
+        self.timeout = timeout
+        self._sock = None
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _connect(self):
+        """Open the connection on first use."""
+        if self._sock is not None:
+            return
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self._sock = sock
+        self._file = sock.makefile("rwb")
+
+    def request(self, op: str, **fields) -> Iterator[Dict]:
+        """Send one request and yield reply lines up to the final one."""
+        self._connect()
+        message = {"op": op, "session": self.session, **fields}
+        self._file.write((json.dumps(message) + "\n").encode("utf-8"))
+        self._file.flush()
+
+        finished = False
+        try:
+            while True:
+                line = self._file.readline()
+                if not line:
+                    raise DaemonError("Daemon closed the connection")
+                reply = json.loads(line)
+                if reply.get("type") == "error":
+                    finished = True
+                    raise DaemonError(reply.get("error", "unknown error"))
+                if reply.get("type") != "token":
+                    finished = True
+                yield reply
+                if finished:
+                    return
+        finally:
+            # Unread replies would be mistaken for the next request's; reconnect
+            if not finished:
+                self.close()
+
+    def call(self, op: str, **fields) -> Dict:
+        """Send a request with a single reply."""
+        replies = list(self.request(op, **fields))
+        return replies[-1]
+
+    def ask(self, query: str) -> Iterator[str]:
+        """Stream the answer to a question in this client's session."""
+        for reply in self.request("ask", query=query):
+            if reply["type"] == "token":
+                yield reply["text"]
+
+    def close(self):
+        """Close the connection."""
+        if self._sock is not None:
+            self._file.close()
+            self._sock.close()
+            self._sock = None
+            self._file = None
+
+
+class RemoteChat:
+    """The chat interface, answered by a shared assistant daemon.
+
+    Email commands run in this process, since they prompt interactively
+    and need no models.
+    """
+
+    def __init__(self, client: DaemonClient, config):
+        self.client = client
+        self.config = config
+        self._email_handler = None
+
+    @property
+    def email_handler(self):
+        """Local email handler, created on first use."""
+        if self._email_handler is None:
+            from ..services.email import EmailService
+            from ..utils.helpers import EmailHandler
+
+            self._email_handler = EmailHandler(EmailService(self.config))
+        return self._email_handler
+
+    def start_chat(self):
+        """Main chat loop, shared with NGOAgent.start_chat."""
+        from .agent import render_stream, run_chat
+
+        run_chat(
+            "Connected to the shared assistant daemon "
+            f"(session [bold]{self.client.session}[/bold]).",
+            lambda: self.email_handler,
+            lambda user_input: render_stream(self.client.ask(user_input)),
+            self._show_history,
+            self._show_status,
+            self._on_error,
+        )
+        self.client.close()
+
+    def _show_history(self):
+        """Show this session's history as kept by the daemon."""
+        from .agent import show_history
+
+        show_history(self.client.call("history")["turns"])
+
+    def _show_status(self):
+        """Show the daemon's status and latency tables."""
+        from .agent import show_latency, show_status
+
+        status = self.client.call("status")
+        show_status([tuple(row) for row in status["rows"]])
+        show_latency(status["latency"], status["counters"])
+
+    @staticmethod
+    def _on_error(e: Exception) -> bool:
+        """Report a failed command; end the chat if the daemon went away."""
+        if isinstance(e, DaemonError):
+            console.print(f"[red]❌ Daemon error: {e}[/red]")
+        elif isinstance(e, OSError):
+            console.print(f"[red]❌ Lost connection to daemon: {e}[/red]")
+            return True
+        else:
+            console.print(f"[red]❌ Error: {e}[/red]")
+        return False
@@ -0,0 +1,199 @@
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+WORD_PATTERN = re.compile(r"\w+")
+SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+# Shortest shared run of text treated as splitter overlap between two chunks
+MIN_OVERLAP = 32
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    """tiktoken's cl100k encoding, or None when unavailable (e.g. offline)."""
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Token count with tiktoken, falling back to ~4 characters per token."""
+    encoding = _encoding()
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+@lru_cache(maxsize=8192)
+def _chunk_tokens(chunk: str) -> int:
+    """count_tokens memoized for knowledge chunks, which recur across queries."""
+    return count_tokens(chunk)
+
+
+def truncate_tokens(text: str, limit: int) -> str:
+    """Cut text down to at most ``limit`` tokens."""
+    if limit <= 0:
+        return ""
+    encoding = _encoding()
+    if encoding is None:
+        return text[: limit * 4]
+    tokens = encoding.encode(text, disallowed_special=())
+    return text if len(tokens) <= limit else encoding.decode(tokens[:limit])
+
+
+def _words(text: str) -> Set[str]:
+    """Lower-cased word set used for redundancy checks."""
+    return set(WORD_PATTERN.findall(text.lower()))
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    """Jaccard similarity of two word sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _overlap(head: str, tail: str, window: int) -> int:
+    """Length of the longest suffix of ``head`` that starts ``tail``."""
+    end = head[-window:]
+    probe = tail[:MIN_OVERLAP]
+    if len(probe) < MIN_OVERLAP:
+        return 0
+
+    position = end.find(probe)
+    while position != -1:
+        length = len(end) - position
+        if tail.startswith(end[position:]):
+            return length
+        position = end.find(probe, position + 1)
+    return 0
+
+
+def _first_sentence(text: str, limit: int = 160) -> str:
+    """First sentence of a turn, capped at ``limit`` characters."""
+    sentence = SENTENCE_END.split(" ".join(text.split()), 1)[0]
+    return sentence if len(sentence) <= limit else sentence[: limit - 1] + "…"
+
+
+class ContextBuilder:
+    """Assembles retrieved chunks and recent turns into a token budget.
+
+    Chunks are picked MMR-style (relevance from retrieval rank, redundancy
+    from word-set Jaccard similarity), near-duplicates are dropped and the
+    text a chunk shares with an already selected neighbour through the
+    splitter overlap is trimmed. History keeps the last ``recent_turns``
+    turns verbatim and summarises older ones to one line each; it may use
+    up to ``history_share`` of the budget, and whatever it leaves goes to
+    knowledge context.
+    """
+
+    def __init__(
+        self,
+        budget: int = 1500,
+        history_share: float = 0.3,
+        recent_turns: int = 2,
+        mmr_lambda: float = 0.7,
+        duplicate_threshold: float = 0.8,
+        overlap_window: int = 400,
+    ):
+        self.budget = budget
+        self.history_share = history_share
+        self.recent_turns = recent_turns
+        self.mmr_lambda = mmr_lambda
+        self.duplicate_threshold = duplicate_threshold
+        self.overlap_window = overlap_window
+
+    def build(
+        self, chunks: List[str], history: Optional[Iterable[Dict]] = None
+    ) -> Tuple[str, str]:
+        """Return (knowledge context, conversation history) within budget."""
+        history_text = self.history_text(history)
+        remaining = (
+            self.budget - count_tokens(history_text) if history_text else self.budget
+        )
+        return "\n\n".join(self.select_chunks(chunks, remaining)), history_text
+
+    def history_text(self, history: Optional[Iterable[Dict]] = None) -> str:
+        """The conversation history block exactly as it goes into the prompt."""
+        return self.history_block(
+            list(history or []), int(self.budget * self.history_share)
+        )
+
+    def select_chunks(self, chunks: List[str], budget: int) -> List[str]:
+        """Diverse, de-overlapped chunks in relevance order, within budget."""
+        candidates = [(i, chunk, _words(chunk)) for i, chunk in enumerate(chunks)]
+        selected: List[Tuple[int, str, Set[str]]] = []
+
+        while candidates:
+            best, best_score = None, None
+            for candidate in candidates:
+                rank, _, words = candidate
+                relevance = 1.0 - rank / len(chunks)
+                redundancy = max(
+                    (_jaccard(words, other) for _, _, other in selected), default=0.0
+                )
+                if redundancy >= self.duplicate_threshold:
+                    continue
+                score = self.mmr_lambda * relevance - (1 - self.mmr_lambda) * redundancy
+                if best_score is None or score > best_score:
+                    best, best_score = candidate, score
+            if best is None:
+                break
+            candidates.remove(best)
+            selected.append(best)
+
+        picked, used = [], 0
+        for _, chunk, _ in selected:
+            chunk = self._trim_overlap(chunk, picked)
+            if not chunk:
+                continue
+            tokens = _chunk_tokens(chunk)
+            if used + tokens > budget:
+                chunk = truncate_tokens(chunk, budget - used)
+                tokens = count_tokens(chunk)
+                if tokens < MIN_OVERLAP:
+                    break
+            picked.append(chunk)
+            used += tokens
+        return picked
+
+    def _trim_overlap(self, chunk: str, picked: List[str]) -> str:
+        """Drop text this chunk shares with already picked neighbours."""
+        for other in picked:
+            start = _overlap(other, chunk, self.overlap_window)
+            if start:
+                chunk = chunk[start:]
+            end = _overlap(chunk, other, self.overlap_window)
+            if end:
+                chunk = chunk[:-end]
+        return chunk.strip()
+
+    def history_block(self, history: List[Dict], budget: int) -> str:
+        """Recent turns verbatim plus one-line summaries of older ones."""
+        if not history or budget <= 0:
+            return ""
+
+        lines, used = [], 0
+        for age, turn in enumerate(reversed(history)):
+            if age < self.recent_turns:
+                text = (
+                    f"User: {turn.get('user', '')}\n"
+                    f"Assistant: {turn.get('assistant', '')}"
+                )
+            else:
+                text = (
+                    f"- Earlier, user asked: {_first_sentence(turn.get('user', ''))} "
+                    f"-> {_first_sentence(turn.get('assistant', ''))}"
+                )
+            tokens = count_tokens(text)
+            if used + tokens > budget:
+                if age < self.recent_turns and not lines:
+                    lines.append(truncate_tokens(text, budget))
+                break
+            lines.append(text)
+            used += tokens
+        return "\n".join(reversed(lines))
@@ -0,0 +1,153 @@
+import json
+import os
+import signal
+import socket
+import socketserver
+import struct
+import sys
+from typing import Callable, Dict, Optional
+from rich.console import Console
+from .client import daemon_available
+
+console = Console()
+
+Send = Callable[[Dict], None]
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """One client connection: JSON request lines in, JSON reply lines out."""
+
+    def handle(self):
+        uid = _peer_uid(self.connection)
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                self.server.assistant.dispatch(json.loads(line), self._send, uid)
+            except (BrokenPipeError, ConnectionResetError):
+                return
+            except Exception as e:
+                try:
+                    self._send({"type": "error", "error": str(e)})
+                except OSError:
+                    return
+
+    def _send(self, message: Dict):
+        line = json.dumps(message, ensure_ascii=False) + "\n"
+        self.wfile.write(line.encode("utf-8"))
+        self.wfile.flush()
+
+
+def _peer_uid(connection: socket.socket) -> Optional[int]:
+    """Uid of the process on the other end of a Unix socket (Linux only)."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    creds = connection.getsockopt(
+        socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")
+    )
+    _, uid, _ = struct.unpack("3i", creds)
+    return uid
+
+
+class _ThreadingUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class AssistantDaemon:
+    """Serves one warm NGOAgent to many thin CLI clients over a Unix socket.
+
+    Each request is a JSON line ``{"op": ..., "session": ..., ...}``; every
+    connection gets its own thread. ``ask`` replies with ``token`` lines
+    followed by ``done``, other ops with a single line. Models, caches and
+    the index are shared; each session id keeps its own history. Session
+    ids are scoped to the connecting user's uid, so one account cannot read
+    or reset another's conversations.
+    """
+
+    def __init__(self, agent, socket_path: str):
+        self.agent = agent
+        self.socket_path = socket_path
+
+    def serve_forever(self):
+        """Bind the socket and serve until interrupted or terminated."""
+        if os.path.exists(self.socket_path):
+            if daemon_available(self.socket_path):
+                raise RuntimeError(f"A daemon is already serving {self.socket_path}")
+            os.unlink(self.socket_path)
+        os.makedirs(os.path.dirname(self.socket_path) or ".", exist_ok=True)
+
+        server = _ThreadingUnixServer(self.socket_path, _RequestHandler)
+        server.assistant = self
+        # Group-writable so every staff account in the group can connect
+        os.chmod(self.socket_path, 0o660)
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+        console.print(
+            f"[green]✅ Assistant daemon listening on {self.socket_path}[/green]"
+        )
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    def dispatch(self, request: Dict, send: Send, uid: Optional[int] = None):
+        """Route one request to its ``_op_*`` handler in the caller's session."""
+        handler = getattr(self, f"_op_{request.get('op')}", None)
+        if handler is None:
+            send({"type": "error", "error": f"Unknown op: {request.get('op')}"})
+            return
+        session = request.get("session") or "default"
+        if uid is not None:
+            session = f"{uid}:{session}"
+        handler(request, session, send)
+
+    def _op_ping(self, request: Dict, session: str, send: Send):
+        send(
+            {
+                "type": "pong",
+                "pid": os.getpid(),
+                "ready": self.agent.warmup.done,
+                "sessions": len(self.agent.sessions),
+            }
+        )
+
+    def _op_ask(self, request: Dict, session: str, send: Send):
+        query = (request.get("query") or "").strip()
+        if not query:
+            send({"type": "error", "error": "Empty query"})
+            return
+
+        parts = []
+        stream = self.agent.stream_response(query, session_id=session)
+        try:
+            for text in stream:
+                parts.append(text)
+                send({"type": "token", "text": text})
+        finally:
+            stream.close()
+
+        self.agent.record_turn(query, "".join(parts), session)
+        send({"type": "done"})
+
+    def _op_history(self, request: Dict, session: str, send: Send):
+        send({"type": "history", "turns": list(self.agent.session_history(session))})
+
+    def _op_reset(self, request: Dict, session: str, send: Send):
+        self.agent.session_history(session).clear()
+        send({"type": "done"})
+
+    def _op_status(self, request: Dict, session: str, send: Send):
+        rows = self.agent.status_rows()
+        rows.append(
+            ("Daemon", f"✅ pid {os.getpid()}, {len(self.agent.sessions)} sessions")
+        )
+        send(
+            {
+                "type": "status",
+                "rows": rows,
+                "latency": self.agent.metrics.summary(),
+                "counters": dict(self.agent.metrics.counters),
+            }
+        )
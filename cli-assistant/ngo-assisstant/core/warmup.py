@@ -0,0 +1,69 @@
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+
+class Warmup:
+    """Runs slow initialization steps once, in order, on a background thread."""
+
+    def __init__(self, steps: List[Tuple[str, Callable[[], None]]]):
+        self.steps = steps
+        self.completed = 0
+        self.current: Optional[str] = None
+        self.errors: List[Tuple[str, Exception]] = []
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._done = threading.Event()
+
+    def start(self):
+        """Start warming up; later calls are no-ops."""
+        with self._lock:
+            if self._thread:
+                return
+            self.started_at = time.monotonic()
+            self._thread = threading.Thread(
+                target=self._run, name="ngo-warmup", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        for name, step in self.steps:
+            self.current = name
+            try:
+                step()
+            except Exception as e:
+                self.errors.append((name, e))
+            self.completed += 1
+
+        self.current = None
+        self.finished_at = time.monotonic()
+        self._done.set()
+
+    @property
+    def done(self) -> bool:
+        """Whether every step has run."""
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Start if needed and block until every step has run."""
+        self.start()
+        return self._done.wait(timeout)
+
+    def describe(self) -> str:
+        """Human-readable progress for the status table."""
+        if not self._thread:
+            return "⏸  Not started"
+        if not self.done:
+            return (
+                f"⏳ {self.current or 'starting'} "
+                f"({self.completed}/{len(self.steps)} steps)"
+            )
+
+        elapsed = self.finished_at - self.started_at
+        if self.errors:
+            failed = ", ".join(name for name, _ in self.errors)
+            return f"⚠️  Done in {elapsed:.1f}s, failed: {failed}"
+        return f"✅ Done in {elapsed:.1f}s"
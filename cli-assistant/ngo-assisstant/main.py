@@ -1,36 +1,143 @@
 import click
 from rich.console import Console
 from .core.agent import NGOAgent
+from .core.client import DaemonClient, RemoteChat, daemon_available
 from .config.settings import NGOConfig
 
 console = Console()
 
 
-@click.command()
+@click.group(invoke_without_command=True)
 @click.option(
     "--knowledge-file",
     "-k",
     default="data/knowledge.txt",
-    help="Path to knowledge base file",
+    help="Knowledge file, directory or glob (e.g. 'docs/**/*.md')",
 )
+@click.option(
+    "--reindex",
+    is_flag=True,
+    help="Re-upsert every knowledge chunk instead of only new ones",
+)
+@click.option(
+    "--local",
+    is_flag=True,
+    help="Run the assistant in this process even if a daemon is serving",
+)
+@click.option("--session", help="Session name on the daemon (resumes its history)")
 @click.version_option(version="1.0.0", prog_name="NGO Campaign Assistant")
-def cli(knowledge_file):
-    """Start the NGO Campaign Assistant chat interface."""
+@click.pass_context
+def cli(ctx, knowledge_file, reindex, local, session):
+    """Start the NGO Campaign Assistant chat interface.
+
+    Connects to the assistant daemon when one is serving, otherwise loads
+    everything in this process.
+    """
+    ctx.obj = {"knowledge_file": knowledge_file, "reindex": reindex}
+    if ctx.invoked_subcommand is not None:
+        return
+
+    config = NGOConfig()
+    socket_path = config.get("daemon_socket", "data/.cache/assistant.sock")
+    if not local and daemon_available(socket_path):
+        console.print(f"[cyan]🔌 Connected to assistant daemon at {socket_path}[/cyan]")
+        RemoteChat(DaemonClient(socket_path, session=session), config).start_chat()
+        return
+
     console.print("[cyan]🚀 Starting NGO Assistant...[/cyan]")
 
+    agent = NGOAgent(config)
+
+    # Load models, index and knowledge in the background while the prompt is up
+    agent.start_warmup(knowledge_file, reindex=reindex)
+
+    # Start chat loop
+    agent.start_chat()
+
+
+@cli.command()
+@click.argument("questions_file", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--output",
+    "-o",
+    default="answers.jsonl",
+    help="JSONL file for answers; an existing file is resumed",
+)
+@click.option("--concurrency", "-c", type=int, help="Questions answered in parallel")
+@click.option("--batch-size", "-b", type=int, help="Questions embedded per batch")
+@click.option(
+    "--cached-sources",
+    is_flag=True,
+    help="Also retrieve context ids for answers served from the answer cache",
+)
+@click.pass_context
+def batch(ctx, questions_file, output, concurrency, batch_size, cached_sources):
+    """Answer every question in a text or CSV file without the chat UI."""
+    from .core.batch import BatchRunner
+
     config = NGOConfig()
     agent = NGOAgent(config)
 
-    # Load knowledge base if file exists
-    if agent.load_knowledge(knowledge_file):
-        console.print(f"[cyan]📚 Knowledge loaded from {knowledge_file}[/cyan]")
-    else:
+    with console.status("[bold green]Warming up...", spinner="dots"):
+        agent.start_warmup(ctx.obj["knowledge_file"], reindex=ctx.obj["reindex"])
+        agent.ensure_ready()
+
+    runner = BatchRunner(
+        agent,
+        concurrency=concurrency or config.get("batch_concurrency", 4),
+        batch_size=batch_size or config.get("batch_size", 32),
+        cached_sources=cached_sources,
+    )
+    stats = runner.run(questions_file, output)
+
+    console.print(
+        f"[green]✅ {stats['answered']} answered ({stats['cached']} from cache), "
+        f"{stats['failed']} failed, {stats['skipped']} already done[/green]"
+    )
+    if stats.get("elapsed"):
+        latency = ""
+        if "p50_ms" in stats:
+            latency = f" · p50 {stats['p50_ms']:.0f} ms · p95 {stats['p95_ms']:.0f} ms"
         console.print(
-            f"[yellow]💡 Create {knowledge_file} to add NGO-specific knowledge[/yellow]"
+            f"[cyan]⚡ {stats['throughput']:.2f} questions/s "
+            f"in {stats['elapsed']:.1f}s{latency}[/cyan]"
         )
+    console.print(f"[dim]Results written to {output}[/dim]")
 
-    # Start chat loop
-    agent.start_chat()
+
+@cli.command()
+@click.option("--socket", "socket_path", help="Unix socket to listen on")
+@click.pass_context
+def serve(ctx, socket_path):
+    """Run one warm assistant shared by every CLI session on this machine."""
+    from .core.daemon import AssistantDaemon
+
+    config = NGOConfig()
+    agent = NGOAgent(config)
+    agent.start_warmup(ctx.obj["knowledge_file"], reindex=ctx.obj["reindex"])
+
+    daemon = AssistantDaemon(
+        agent, socket_path or config.get("daemon_socket", "data/.cache/assistant.sock")
+    )
+    try:
+        daemon.serve_forever()
+    except RuntimeError as e:
+        console.print(f"[red]❌ {e}[/red]")
+    except KeyboardInterrupt:
+        console.print("[green]👋 Daemon stopped[/green]")
+
+
+@cli.command()
+@click.argument("path")
+@click.option("--reindex", is_flag=True, help="Re-embed every chunk")
+def ingest(path, reindex):
+    """Index a knowledge file, directory or glob with progress output."""
+    config = NGOConfig()
+    agent = NGOAgent(config)
+    agent.knowledge_service.initialize()
+
+    if not agent.knowledge_service.load_path(path, reindex=reindex):
+        console.print(f"[red]❌ No knowledge files found at {path}[/red]")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,137 @@
+import heapq
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens; keeps codes like '80g' and digit runs intact."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """Okapi BM25 over an inverted index of knowledge chunks, grouped by source.
+
+    Postings are updated incrementally as sources are set, so searches
+    never pay for indexing. New chunks are tokenized before the lock is
+    taken. A chunk shared by several sources is indexed once and dropped
+    when its last source no longer has it.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._sources: Dict[str, Dict[str, str]] = {}
+        self._texts: Dict[str, str] = {}
+        self._refs: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._total_length = 0
+
+    def set_source(self, source: str, chunks: Dict[str, str]):
+        """Replace all chunks indexed for a source (chunk_id -> text)."""
+        chunks = dict(chunks)
+        with self._lock:
+            known = set(self._texts)
+        counts = {
+            cid: Counter(tokenize(text))
+            for cid, text in chunks.items()
+            if cid not in known
+        }
+
+        with self._lock:
+            previous = self._sources.pop(source, {})
+            for cid in chunks.keys() - previous.keys():
+                self._add(cid, chunks[cid], counts.get(cid))
+            for cid in previous.keys() - chunks.keys():
+                self._remove(cid)
+            if chunks:
+                self._sources[source] = chunks
+
+    def _add(self, cid: str, text: str, counts: Optional[Counter]):
+        """Reference a chunk, indexing it on first use (caller holds the lock)."""
+        self._refs[cid] = self._refs.get(cid, 0) + 1
+        if self._refs[cid] > 1:
+            return
+
+        counts = counts if counts is not None else Counter(tokenize(text))
+        for term, tf in counts.items():
+            self._postings.setdefault(term, {})[cid] = tf
+        self._texts[cid] = text
+        self._lengths[cid] = sum(counts.values())
+        self._total_length += self._lengths[cid]
+
+    def _remove(self, cid: str):
+        """Drop a reference, unindexing the chunk at zero (caller holds the lock)."""
+        self._refs[cid] -= 1
+        if self._refs[cid]:
+            return
+
+        del self._refs[cid]
+        for term in set(tokenize(self._texts.pop(cid))):
+            postings = self._postings[term]
+            del postings[cid]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(cid)
+
+    def sources(self) -> Set[str]:
+        """Names of every indexed source."""
+        with self._lock:
+            return set(self._sources)
+
+    def snapshot(self) -> Dict[str, Dict[str, str]]:
+        """Copy of every source's chunks (chunk_id -> text), for persisting."""
+        with self._lock:
+            return {source: dict(chunks) for source, chunks in self._sources.items()}
+
+    def chunk_ids(self) -> Set[str]:
+        """IDs of every indexed chunk."""
+        with self._lock:
+            return set(self._texts)
+
+    def count(self) -> int:
+        """Number of distinct chunks indexed."""
+        with self._lock:
+            return len(self._texts)
+
+    def search(
+        self, query: str, k: int = 3, sources: Optional[Set[str]] = None
+    ) -> List[Tuple[str, str, float]]:
+        """Return (chunk_id, text, score) for the k best-matching chunks.
+
+        With ``sources``, only chunks from those sources are scored.
+        """
+        with self._lock:
+            n = len(self._texts)
+            if not n:
+                return []
+            avg_length = self._total_length / n
+
+            allowed = None
+            if sources is not None:
+                allowed = {
+                    cid for source in sources for cid in self._sources.get(source, {})
+                }
+
+            scores: Dict[str, float] = defaultdict(float)
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+
+                df = len(postings)
+                idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+                for cid, tf in postings.items():
+                    if allowed is not None and cid not in allowed:
+                        continue
+                    norm = 1 - self.b + self.b * self._lengths[cid] / avg_length
+                    scores[cid] += idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+
+            best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            return [(cid, self._texts[cid], score) for cid, score in best]
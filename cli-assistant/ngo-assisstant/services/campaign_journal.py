@@ -0,0 +1,181 @@
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+SENT = "sent"
+FAILED = "failed"
+
+
+class CampaignJournal:
+    """Append-only delivery log for one bulk email campaign.
+
+    ``<id>.json`` holds the subject/body, ``<id>.recipients`` the recipient
+    snapshot and ``<id>.jsonl`` one record per delivery attempt. Records
+    are fsync'd every ``fsync_every`` writes, so a crash can only lose (and
+    later resend to) the last unsynced batch.
+    """
+
+    def __init__(self, directory: str, campaign_id: str, fsync_every: int = 100):
+        self.directory = Path(directory)
+        self.campaign_id = campaign_id
+        self.fsync_every = fsync_every
+        self.meta_path = self.directory / f"{campaign_id}.json"
+        self.recipients_path = self.directory / f"{campaign_id}.recipients"
+        self.log_path = self.directory / f"{campaign_id}.jsonl"
+
+        self.meta = {}
+        self.state: Dict[str, Tuple[str, int]] = {}
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._log = None
+
+    @classmethod
+    def create(
+        cls,
+        directory: str,
+        subject: str,
+        body: str,
+        recipients: Iterable[str],
+        fsync_every: int = 100,
+        merge: Optional[Dict] = None,
+    ) -> "CampaignJournal":
+        """Start a new campaign journal with a recipient snapshot.
+
+        ``merge`` records where per-recipient template fields come from so
+        a resumed campaign personalises messages the same way.
+        """
+        campaign_id = f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+        journal = cls(directory, campaign_id, fsync_every)
+        journal.directory.mkdir(parents=True, exist_ok=True)
+
+        total = 0
+        with open(journal.recipients_path, "w", encoding="utf-8") as f:
+            for recipient in recipients:
+                f.write(recipient + "\n")
+                total += 1
+            f.flush()
+            os.fsync(f.fileno())
+
+        journal.meta = {
+            "id": campaign_id,
+            "subject": subject,
+            "body": body,
+            "total": total,
+            "merge": merge or {},
+            "created": datetime.now().isoformat(),
+        }
+        with open(journal.meta_path, "w", encoding="utf-8") as f:
+            json.dump(journal.meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+
+        return journal
+
+    @classmethod
+    def load(
+        cls, directory: str, campaign_id: str, fsync_every: int = 100
+    ) -> "CampaignJournal":
+        """Reopen an existing campaign and replay its delivery log."""
+        journal = cls(directory, campaign_id, fsync_every)
+        with open(journal.meta_path, "r", encoding="utf-8") as f:
+            journal.meta = json.load(f)
+        journal._replay()
+        return journal
+
+    @staticmethod
+    def list_campaigns(directory: str) -> List[str]:
+        """Campaign IDs in the journal directory, newest first."""
+        path = Path(directory)
+        if not path.exists():
+            return []
+        return sorted((p.stem for p in path.glob("*.json")), reverse=True)
+
+    def _replay(self):
+        """Rebuild per-recipient state, tolerating a torn final line."""
+        if not self.log_path.exists():
+            return
+
+        with open(self.log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self.state[record["r"]] = (record["s"], record["a"])
+
+    def attempts(self, recipient: str) -> int:
+        """Number of recorded attempts for a recipient."""
+        return self.state.get(recipient, ("", 0))[1]
+
+    def record(self, recipient: str, status: str):
+        """Append one delivery result; fsync in batches."""
+        with self._lock:
+            attempt = self.attempts(recipient) + 1
+            self.state[recipient] = (status, attempt)
+
+            if self._log is None:
+                self._log = open(self.log_path, "a", encoding="utf-8")
+            self._log.write(
+                json.dumps(
+                    {
+                        "c": self.campaign_id,
+                        "r": recipient,
+                        "s": status,
+                        "a": attempt,
+                        "t": time.time(),
+                    }
+                )
+                + "\n"
+            )
+
+            self._unsynced += 1
+            if self._unsynced >= self.fsync_every:
+                self._sync()
+
+    def _sync(self):
+        """Flush buffered records to disk (caller holds the lock)."""
+        if self._log is None:
+            return
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self._unsynced = 0
+
+    def close(self):
+        """Flush and fsync outstanding records."""
+        with self._lock:
+            self._sync()
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+    def iter_pending(self, max_attempts: int) -> Iterator[str]:
+        """Stream recipients not yet delivered that still have attempts left."""
+        with open(self.recipients_path, "r", encoding="utf-8") as f:
+            for line in f:
+                recipient = line.strip()
+                if not recipient:
+                    continue
+                status, attempts = self.state.get(recipient, ("", 0))
+                if status != SENT and attempts < max_attempts:
+                    yield recipient
+
+    def count_pending(self, max_attempts: int) -> int:
+        """Number of recipients iter_pending would yield."""
+        return sum(1 for _ in self.iter_pending(max_attempts))
+
+    def summary(self) -> Dict[str, int]:
+        """Delivered / failed / untried counts."""
+        sent = sum(1 for status, _ in self.state.values() if status == SENT)
+        failed = sum(1 for status, _ in self.state.values() if status == FAILED)
+        total = self.meta.get("total", 0)
+        return {
+            "total": total,
+            "sent": sent,
+            "failed": failed,
+            "untried": max(0, total - sent - failed),
+        }
@@ -0,0 +1,49 @@
+from typing import Iterator
+
+# Characters read from a knowledge file per step
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+
+def iter_chunks(
+    file_path: str,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> Iterator[str]:
+    """Yield splitter chunks of a text file without reading it whole.
+
+    The file is read through a buffered reader ``buffer_size`` characters
+    at a time and each buffer is split with the recursive character
+    splitter. Every chunk but the last is yielded; the last may be cut by
+    the buffer boundary, so the text from its start (which already holds
+    the overlap with the previous chunk) is carried into the next buffer
+    and split again. Memory stays around one buffer whatever the file size.
+
+    Chunks near a buffer boundary can differ from splitting the whole file
+    at once, because the splitter sees the overlap text in front of the
+    carried chunk. Chunk IDs hash the text, so an index must keep the
+    buffer size it was built with. Changing it re-embeds the chunks around
+    the old boundaries and removes their vectors.
+    """
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size, chunk_overlap=chunk_overlap, length_function=len
+    )
+    buffer_size = max(buffer_size, chunk_size * 4)
+    carry = ""
+
+    with open(file_path, "r", encoding="utf-8") as f:
+        for block in iter(lambda: f.read(buffer_size), ""):
+            text = carry + block
+            chunks = splitter.split_text(text)
+            if len(chunks) <= 1:
+                carry = text
+                continue
+
+            yield from chunks[:-1]
+            start = text.rfind(chunks[-1])
+            carry = text[start:] if start >= 0 else chunks[-1]
+
+    if carry:
+        yield from splitter.split_text(carry)
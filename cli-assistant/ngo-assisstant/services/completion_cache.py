@@ -0,0 +1,223 @@
+import asyncio
+import contextvars
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterator, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS completions (
+    key TEXT PRIMARY KEY,
+    params TEXT NOT NULL,
+    prompt TEXT NOT NULL,
+    completion TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS completions_last_used ON completions (last_used);
+"""
+
+
+class ReplayMiss(LookupError):
+    """Raised in replay mode for a prompt with no recorded completion."""
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace within lines and drop blank lines."""
+    lines = (" ".join(line.split()) for line in prompt.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+class CompletionCache:
+    """SQLite store of LLM completions keyed by prompt and model parameters.
+
+    Keys hash the normalized prompt together with the model parameters, so
+    whitespace-only differences share an entry while a model or
+    temperature change does not. Entries expire after ``ttl`` seconds and
+    the least recently used are evicted once the stored text exceeds
+    ``max_bytes``; pass None for either to keep entries forever, as a
+    recording does. In ``replay`` mode expiry is ignored and a miss raises
+    ReplayMiss instead of reaching the network.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: Optional[float] = 86400,
+        max_bytes: Optional[int] = 64 << 20,
+        replay: bool = False,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.replay = replay
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+    @staticmethod
+    def key(prompt: str, params: Dict) -> str:
+        """Cache key for a prompt under the given model parameters."""
+        payload = json.dumps(
+            {"prompt": normalize_prompt(prompt), "params": params}, sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a live cached completion, or None (ReplayMiss in replay)."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT completion, created FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+            if row and (self.replay or self.ttl is None or now - row[1] <= self.ttl):
+                self._db.execute(
+                    "UPDATE completions SET last_used = ? WHERE key = ?", (now, key)
+                )
+                self._db.commit()
+                self.hits += 1
+                return row[0]
+            self.misses += 1
+
+        if self.replay:
+            raise ReplayMiss(f"No recorded completion for prompt {key[:12]}")
+        return None
+
+    def put(self, key: str, prompt: str, completion: str, params: Dict):
+        """Record a completion, evicting least recently used entries over the cap."""
+        if self.replay or not completion:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO completions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    json.dumps(params, sort_keys=True),
+                    prompt,
+                    completion,
+                    len(prompt) + len(completion),
+                    now,
+                    now,
+                ),
+            )
+            if self.ttl is not None:
+                self._db.execute(
+                    "DELETE FROM completions WHERE created < ?", (now - self.ttl,)
+                )
+            if self.max_bytes is not None:
+                self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until under ``max_bytes``."""
+        total = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM completions"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        doomed, freed = [], 0
+        for key, size in self._db.execute(
+            "SELECT key, size FROM completions ORDER BY last_used"
+        ):
+            doomed.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._db.executemany("DELETE FROM completions WHERE key = ?", doomed)
+
+    def stats(self) -> dict:
+        """Hit/miss counters and occupancy."""
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._db.close()
+
+
+class CachedCompletion:
+    """Stand-in for an LLM message served from the completion cache."""
+
+    def __init__(self, content: str):
+        self.content = content
+        self.usage_metadata = None
+
+
+class CachedLLM:
+    """Chat model wrapper answering repeated prompts from a CompletionCache.
+
+    Supports the ``invoke``/``stream``/``ainvoke`` calls the agent makes.
+    ``llm`` may be None in replay mode, where every prompt must have been
+    recorded. Streams are stored only once they finish without error.
+    """
+
+    def __init__(self, llm, cache: CompletionCache, params: Dict, metrics=None):
+        self.llm = llm
+        self.cache = cache
+        self.params = params
+        self.metrics = metrics
+
+    def _lookup(self, prompt: str):
+        """(key, cached completion or None); raises ReplayMiss when replaying."""
+        key = self.cache.key(prompt, self.params)
+        cached = self.cache.get(key)
+        if self.metrics is not None:
+            self.metrics.mark(completion_cache_hit=cached is not None)
+        if cached is None and self.llm is None:
+            raise ReplayMiss("No LLM configured and no recorded completion")
+        return key, cached
+
+    def invoke(self, prompt: str):
+        key, cached = self._lookup(prompt)
+        if cached is not None:
+            return CachedCompletion(cached)
+
+        response = self.llm.invoke(prompt)
+        self.cache.put(key, prompt, response.content, self.params)
+        return response
+
+    def stream(self, prompt: str) -> Iterator:
+        key, cached = self._lookup(prompt)
+        if cached is not None:
+            yield CachedCompletion(cached)
+            return
+
+        parts = []
+        for chunk in self.llm.stream(prompt):
+            parts.append(chunk.content or "")
+            yield chunk
+        self.cache.put(key, prompt, "".join(parts), self.params)
+
+    async def ainvoke(self, prompt: str):
+        loop = asyncio.get_running_loop()
+        key, cached = await loop.run_in_executor(
+            None, contextvars.copy_context().run, self._lookup, prompt
+        )
+        if cached is not None:
+            return CachedCompletion(cached)
+
+        response = await self.llm.ainvoke(prompt)
+        await loop.run_in_executor(
+            None, self.cache.put, key, prompt, response.content, self.params
+        )
+        return response
+
+    def stats(self) -> dict:
+        """Hit/miss counters of the underlying cache."""
+        return self.cache.stats()
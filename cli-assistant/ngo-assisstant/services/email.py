@@ -1,10 +1,16 @@
+import atexit
 import json
-import smtplib
-from typing import List, Dict
-from email.mime.text import MIMEText
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
 from pathlib import Path
-from email.mime.multipart import MIMEMultipart
 from rich.console import Console
+from .recipient_store import RecipientStore
+from .smtp_pool import SMTPConnectionPool
+from .templates import CompiledTemplate
+from ..utils.rate_limit import TokenBucket, parse_rate_map
+from ..utils.recipients import RecipientSource
 
 console = Console()
 
@@ -12,34 +18,73 @@ console = Console()
 class EmailService:
     def __init__(self, config):
         self.config = config
+        self._pool = None
+        self._store = None
+        self._pool_lock = threading.Lock()
 
-    def send_single(
-        self, to_email: str, subject: str, body: str, from_name: str = None
-    ) -> bool:
-        """Send single email."""
+    def _get_pool(self) -> Optional[SMTPConnectionPool]:
+        """Create the shared SMTP connection pool on first use."""
         smtp_server = self.config.get("smtp_server")
-        smtp_port = self.config.get("smtp_port", 587)
         email = self.config.get("email")
         password = self.config.get("email_password")
 
         if not all([smtp_server, email, password]):
-            console.print("[yellow]  Email not configured[/yellow]")
-            return False
+            return None
 
-        try:
-            msg = MIMEMultipart()
-            msg["From"] = f"{from_name or 'NGO Assistant'} <{email}>"
-            msg["To"] = to_email
-            msg["Subject"] = subject
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = SMTPConnectionPool(
+                    smtp_server,
+                    self.config.get("smtp_port", 587),
+                    email,
+                    password,
+                    size=self.config.get("smtp_pool_size", 4),
+                    max_messages=self.config.get("smtp_max_messages", 100),
+                    timeout=self.config.get("smtp_timeout", 30),
+                )
+                atexit.register(self._pool.close)
+            return self._pool
 
-            msg.attach(MIMEText(body, "plain"))
+    def compile_template(
+        self,
+        subject: str,
+        body: str,
+        from_name: str = None,
+        defaults: Optional[Dict[str, str]] = None,
+    ) -> CompiledTemplate:
+        """Parse and pre-encode a message once for many recipients."""
+        return CompiledTemplate(
+            subject,
+            body,
+            self.config.get("email") or "",
+            from_name or "NGO Assistant",
+            defaults,
+        )
 
-            server = smtplib.SMTP(smtp_server, smtp_port)
-            server.starttls()
-            server.login(email, password)
-            server.sendmail(email, to_email, msg.as_string())
-            server.quit()
+    def send_single(
+        self, to_email: str, subject: str, body: str, from_name: str = None
+    ) -> bool:
+        """Send single email over a pooled SMTP session."""
+        return self.send_message(
+            to_email, self.compile_template(subject, body, from_name)
+        )
+
+    def send_message(
+        self,
+        to_email: str,
+        template: CompiledTemplate,
+        fields: Optional[Dict[str, str]] = None,
+    ) -> bool:
+        """Render a compiled template for one recipient and send it."""
+        pool = self._get_pool()
+        if pool is None:
+            console.print("[yellow]  Email not configured[/yellow]")
+            return False
 
+        try:
+            pool.send(
+                self.config.get("email"), [to_email], template.render(to_email, fields)
+            )
             return True
 
         except Exception as e:
@@ -47,34 +92,154 @@ class EmailService:
             return False
 
     def send_bulk(
-        self, recipients: List[str], subject: str, body: str
-    ) -> Dict[str, int]:
-        """Send bulk emails with progress tracking."""
+        self,
+        recipients: Iterable[str],
+        subject: str,
+        body: str,
+        on_result: Optional[Callable[[str, bool], None]] = None,
+        total: Optional[int] = None,
+        merge_fields: Optional[Dict[str, Dict[str, str]]] = None,
+        defaults: Optional[Dict[str, str]] = None,
+    ) -> Dict:
+        """Send bulk emails concurrently under a token-bucket rate limit.
+
+        ``recipients`` may be any iterable (pass ``total`` for generators);
+        ``on_result(recipient, success)`` is called as each send completes.
+        The template is compiled once; ``merge_fields`` maps case-folded
+        addresses to their ``[FIELD]`` values.
+        """
+        template = self.compile_template(subject, body, defaults=defaults)
+        merge_fields = merge_fields or {}
         results = {"successful": 0, "failed": 0}
+        total = total if total is not None else len(recipients)
+        max_in_flight = max(1, self.config.get("email_max_in_flight", 4))
+        bucket = TokenBucket(self.config.get("email_rate", 5.0))
+        domain_buckets = {
+            domain: TokenBucket(rate)
+            for domain, rate in parse_rate_map(
+                self.config.get("email_domain_rates", "")
+            ).items()
+        }
+        in_flight = threading.BoundedSemaphore(max_in_flight)
+        lock = threading.Lock()
+        latencies = []
 
-        console.print(
-            f"[cyan]📤 Sending mail to {len(recipients)} recipients...[/cyan]"
-        )
+        console.print(f"[cyan]📤 Sending mail to {total} recipients...[/cyan]")
+
+        def deliver(recipient: str):
+            domain_bucket = domain_buckets.get(recipient.rsplit("@", 1)[-1].lower())
+            if domain_bucket:
+                domain_bucket.acquire()
+            start = time.perf_counter()
+            success = self.send_message(
+                recipient, template, merge_fields.get(recipient.casefold())
+            )
+            return success, time.perf_counter() - start
 
-        for i, recipient in enumerate(recipients, 1):
-            success = self.send_single(recipient, subject, body)
+        def record(recipient: str, future):
+            in_flight.release()
+            try:
+                success, latency = future.result()
+            except Exception:
+                success, latency = False, 0.0
 
-            if success:
-                results["successful"] += 1
-                console.print(f"[green] {i}/{len(recipients)}: {recipient}[/green]")
-            else:
-                results["failed"] += 1
-                console.print(f"[red] {i}/{len(recipients)}: {recipient}[/red]")
+            if on_result:
+                on_result(recipient, success)
 
-            # Rate limiting
-            import time
+            with lock:
+                latencies.append(latency)
+                key = "successful" if success else "failed"
+                results[key] += 1
+                done = results["successful"] + results["failed"]
+                color = "green" if success else "red"
+                console.print(f"[{color}] {done}/{total}: {recipient}[/{color}]")
 
-            time.sleep(0.5)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(
+            max_workers=max_in_flight, thread_name_prefix="email"
+        ) as executor:
+            for recipient in recipients:
+                bucket.acquire()
+                in_flight.acquire()
+                future = executor.submit(deliver, recipient)
+                future.add_done_callback(
+                    lambda f, recipient=recipient: record(recipient, f)
+                )
 
+        elapsed = time.perf_counter() - started
+        results["elapsed"] = elapsed
+        sent = results["successful"] + results["failed"]
+        results["throughput"] = sent / elapsed if elapsed else 0.0
+        results["latency"] = self._latency_stats(latencies)
         return results
 
-    def load_email_lists(self) -> Dict[str, List[str]]:
-        """Load email lists from data directory."""
+    @staticmethod
+    def _latency_stats(latencies: List[float]) -> Dict[str, float]:
+        """Mean and percentile send latency in milliseconds."""
+        if not latencies:
+            return {}
+
+        ordered = sorted(latencies)
+
+        def percentile(p: float) -> float:
+            return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000
+
+        return {
+            "mean_ms": sum(ordered) / len(ordered) * 1000,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "max_ms": ordered[-1] * 1000,
+        }
+
+    def recipient_store(self) -> Optional[RecipientStore]:
+        """Open the segment store and import new or changed list files."""
+        path = self.config.get("recipient_db")
+        if not path:
+            return None
+
+        try:
+            with self._pool_lock:
+                if self._store is None:
+                    self._store = RecipientStore(path)
+            files = {
+                name: source.path for name, source in self.load_email_lists().items()
+            }
+            imported = self._store.import_files(files)
+            for segment, count in imported.items():
+                console.print(f"[dim]Indexed {count} addresses into '{segment}'[/dim]")
+            return self._store
+        except Exception as e:
+            console.print(f"[yellow]⚠️ Recipient store unavailable: {e}[/yellow]")
+            return None
+
+    def segment_source(self, store: RecipientStore, expression: str) -> RecipientSource:
+        """Audience for a segment expression, resolved inside the store."""
+        return RecipientSource(
+            expression,
+            lambda: store.iter_emails(expression),
+            dedup="none",
+            counter=lambda: store.count(expression),
+        )
+
+    def recipient_source(self, name: str, lines: List[str]) -> RecipientSource:
+        """Clean, de-duplicated recipients from typed-in lines."""
+        return RecipientSource.from_list(name, lines, **self._recipient_options())
+
+    def recipient_source_from_file(self, name: str, path: str) -> RecipientSource:
+        """Clean, de-duplicated recipients streamed from a file."""
+        return RecipientSource.from_file(name, path, **self._recipient_options())
+
+    def _recipient_options(self) -> Dict:
+        """RecipientSource settings from config."""
+        return {
+            "dedup": self.config.get("recipient_dedup", "exact"),
+            "bloom_capacity": self.config.get("recipient_bloom_capacity", 10_000_000),
+            "suppressed": self._store.is_suppressed if self._store else None,
+        }
+
+    def load_email_lists(self) -> Dict[str, RecipientSource]:
+        """Find email lists in the data directory (streamed, not loaded)."""
         email_lists = {}
         data_dir = Path("data")
         email_files = ["donors.txt", "volunteers.txt", "board_members.txt", "media.txt"]
@@ -82,15 +247,10 @@ class EmailService:
         for file_name in email_files:
             file_path = data_dir / file_name
             if file_path.exists():
-                try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        emails = [
-                            line.strip() for line in f if line.strip() and "@" in line
-                        ]
-                        list_name = file_name.replace(".txt", "")
-                        email_lists[list_name] = emails
-                except Exception as e:
-                    console.print(f"[red] Error loading {file_name}: {e}[/red]")
+                list_name = file_name.replace(".txt", "")
+                email_lists[list_name] = RecipientSource.from_file(
+                    list_name, str(file_path)
+                )
 
         return email_lists
 
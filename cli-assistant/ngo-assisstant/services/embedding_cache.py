@@ -0,0 +1,248 @@
+import atexit
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional, Tuple
+import numpy as np
+from rich.console import Console
+
+try:
+    from langchain_core.embeddings import Embeddings
+except ImportError:
+    Embeddings = object
+
+console = Console()
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper backed by a memory-mapped, LRU-bounded vector cache.
+
+    Vectors live in ``vectors.bin`` (one fixed-size row per slot) and
+    ``index.json`` maps hash(model, kind, text) to its slot in LRU order.
+    ``keys.bin`` stores each slot's key digest so a slot overwritten after
+    the last index flush is detected instead of returning a wrong vector.
+    The index is written every ``flush_every`` new vectors, after each
+    ingest and at exit. The JSON dump runs outside the lock from a
+    snapshot, so lookups and embeds never wait for it.
+    """
+
+    def __init__(
+        self,
+        embeddings,
+        model_name: str,
+        cache_dir: str,
+        max_entries: int = 100_000,
+        dtype: str = "float16",
+        flush_every: int = 4096,
+    ):
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.dtype = np.dtype(dtype)
+        self.flush_every = flush_every
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._slots: "OrderedDict[str, int]" = OrderedDict()
+        self._free_slots: List[int] = []
+        self._vectors: Optional[np.memmap] = None
+        self._keys: Optional[np.memmap] = None
+        self._dim: Optional[int] = None
+        self._dirty = 0
+        self._generation = 0
+        self._saved_generation = 0
+        self._flush_lock = threading.Lock()
+
+        self._index_path = self.cache_dir / "index.json"
+        self._vectors_path = self.cache_dir / "vectors.bin"
+        self._keys_path = self.cache_dir / "keys.bin"
+        self._load()
+        atexit.register(self.flush)
+
+    def _key(self, kind: str, text: str) -> str:
+        """Cache key for a text under this model."""
+        raw = f"{self.model_name}\0{kind}\0{text}".encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    @staticmethod
+    def _digest(key: str) -> np.ndarray:
+        """Raw 32-byte digest of a hex cache key."""
+        return np.frombuffer(bytes.fromhex(key), dtype=np.uint8)
+
+    def _load(self):
+        """Open an existing cache if it matches this model and dtype."""
+        paths = (self._index_path, self._vectors_path, self._keys_path)
+        if not all(path.exists() for path in paths):
+            return
+
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+
+            if (
+                meta.get("model") != self.model_name
+                or meta.get("dtype") != self.dtype.name
+                or meta.get("capacity") != self.max_entries
+            ):
+                console.print(
+                    "[yellow]⚠️  Embedding cache reset (settings changed)[/yellow]"
+                )
+                return
+
+            self._open_vectors(meta["dim"], mode="r+")
+            self._slots = OrderedDict(meta.get("slots", []))
+            used = set(self._slots.values())
+            self._free_slots = [
+                i for i in range(self.max_entries - 1, -1, -1) if i not in used
+            ]
+        except Exception as e:
+            console.print(
+                f"[yellow]⚠️  Embedding cache unreadable, starting fresh: {e}[/yellow]"
+            )
+            self._slots = OrderedDict()
+            self._vectors = None
+            self._keys = None
+            self._dim = None
+
+    def _open_vectors(self, dim: int, mode: str):
+        """Map the vector file, creating it when needed."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._dim = dim
+        self._vectors = np.memmap(
+            self._vectors_path,
+            dtype=self.dtype,
+            mode=mode,
+            shape=(self.max_entries, dim),
+        )
+        self._keys = np.memmap(
+            self._keys_path, dtype=np.uint8, mode=mode, shape=(self.max_entries, 32)
+        )
+
+    def _ensure_vectors(self, dim: int):
+        """Create the vector file on first insert."""
+        if self._vectors is not None:
+            return
+        self._open_vectors(dim, mode="w+")
+        self._free_slots = list(range(self.max_entries - 1, -1, -1))
+
+    def _get(self, key: str) -> Optional[List[float]]:
+        """Look up a vector and mark it recently used."""
+        slot = self._slots.get(key)
+        if slot is None:
+            return None
+        if not np.array_equal(self._keys[slot], self._digest(key)):
+            del self._slots[key]
+            return None
+        self._slots.move_to_end(key)
+        return self._vectors[slot].astype(np.float32).tolist()
+
+    def _put(self, key: str, vector: List[float]):
+        """Store a vector, evicting the least recently used entry if full."""
+        self._ensure_vectors(len(vector))
+        if key in self._slots:
+            slot = self._slots.pop(key)
+        elif self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            _, slot = self._slots.popitem(last=False)
+
+        self._vectors[slot] = np.asarray(vector, dtype=self.dtype)
+        self._keys[slot] = self._digest(key)
+        self._slots[key] = slot
+        self._dirty += 1
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents, computing only the ones not already cached."""
+        return self._embed(texts, "doc", self.embeddings.embed_documents)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query, served from cache when seen before."""
+        return self._embed(
+            [text], "query", lambda t: [self.embeddings.embed_query(t[0])]
+        )[0]
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed many queries in one model call, cached as queries.
+
+        Assumes a symmetric model (query and document embeddings match),
+        which holds for the sentence-transformers models used here.
+        """
+        return self._embed(texts, "query", self.embeddings.embed_documents)
+
+    def _embed(self, texts: List[str], kind: str, compute) -> List[List[float]]:
+        """Shared cache lookup / batch compute path."""
+        keys = [self._key(kind, text) for text in texts]
+        results: List[Optional[List[float]]] = [None] * len(texts)
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                results[i] = self._get(key)
+            missing = [i for i, vector in enumerate(results) if vector is None]
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            vectors = compute([texts[i] for i in missing])
+            snapshot = None
+            with self._lock:
+                for i, vector in zip(missing, vectors):
+                    results[i] = list(vector)
+                    self._put(keys[i], vector)
+                if self._dirty >= self.flush_every:
+                    snapshot = self._snapshot()
+            if snapshot is not None:
+                self._write(snapshot)
+
+        return results
+
+    def flush(self):
+        """Persist pending vectors and the LRU index."""
+        with self._lock:
+            if self._vectors is None or not self._dirty:
+                return
+            snapshot = self._snapshot()
+        self._write(snapshot)
+
+    def _snapshot(self) -> Tuple[int, dict]:
+        """(generation, index metadata) to persist; caller holds the lock."""
+        self._dirty = 0
+        self._generation += 1
+        return self._generation, {
+            "model": self.model_name,
+            "dtype": self.dtype.name,
+            "capacity": self.max_entries,
+            "dim": self._dim,
+            "slots": list(self._slots.items()),
+        }
+
+    def _write(self, snapshot: Tuple[int, dict]):
+        """Flush the vector maps, then write the index unless a newer one was."""
+        generation, meta = snapshot
+        with self._flush_lock:
+            if generation <= self._saved_generation:
+                return
+            self._saved_generation = generation
+            try:
+                # Vectors first, so the index never points at unwritten rows
+                self._vectors.flush()
+                self._keys.flush()
+                tmp_path = self._index_path.with_suffix(".json.tmp")
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(meta, f)
+                os.replace(tmp_path, self._index_path)
+            except Exception as e:
+                console.print(f"[yellow]⚠️  Embedding cache flush failed: {e}[/yellow]")
+
+    def stats(self) -> dict:
+        """Hit/miss counters and occupancy."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._slots),
+            "capacity": self.max_entries,
+        }
@@ -1,58 +1,234 @@
+import contextvars
+import glob
+import hashlib
+import json
+import multiprocessing
 import os
+import time
 import warnings
-from typing import List
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import nullcontext
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple
 from rich.console import Console
-from langchain.schema import Document
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from rich.progress import Progress
+from .bm25 import BM25Index
+from .chunker import DEFAULT_BUFFER_SIZE, iter_chunks
+from .manifest import KnowledgeManifest, chunk_id
+from ..utils.metrics import Metrics
 
-# Import with fallbacks
-try:
-    from langchain_huggingface import HuggingFaceEmbeddings
-except ImportError:
+if TYPE_CHECKING:
+    from langchain.schema import Document
+
+console = Console()
+
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+# Heavy dependencies (langchain, torch, pinecone) are imported on first use
+# so the CLI starts without paying for them.
+def _load_huggingface_embeddings():
+    """Import HuggingFaceEmbeddings with fallbacks."""
     try:
-        from langchain_community.embeddings import HuggingFaceEmbeddings
+        from langchain_huggingface import HuggingFaceEmbeddings
+    except ImportError:
+        try:
+            from langchain_community.embeddings import HuggingFaceEmbeddings
 
-        warnings.filterwarnings(
-            "ignore", message=".*HuggingFaceEmbeddings.*deprecated.*"
-        )
+            warnings.filterwarnings(
+                "ignore", message=".*HuggingFaceEmbeddings.*deprecated.*"
+            )
+        except ImportError:
+            return None
+    return HuggingFaceEmbeddings
+
+
+def _load_pinecone():
+    """Import the Pinecone client and LangChain store."""
+    try:
+        from langchain_pinecone import PineconeVectorStore
+        from pinecone import Pinecone
     except ImportError:
-        HuggingFaceEmbeddings = None
+        return None, None
+    return PineconeVectorStore, Pinecone
 
-try:
-    from langchain_pinecone import PineconeVectorStore
-    from pinecone import Pinecone
-except ImportError:
-    PineconeVectorStore = None
-    Pinecone = None
 
-console = Console()
+def _chunk_file(
+    file_path: str, buffer_size: int = DEFAULT_BUFFER_SIZE
+) -> Tuple[str, Dict[str, str]]:
+    """Split one file into {chunk_id: text}.
+
+    Module-level so ingestion can run it in worker processes.
+    """
+    chunks = {}
+    for chunk in iter_chunks(file_path, buffer_size=buffer_size):
+        chunks.setdefault(chunk_id(chunk), chunk)
+    return os.path.abspath(file_path), chunks
+
+
+def _resolve_knowledge_files(path: str, patterns: str) -> List[str]:
+    """Expand a file, directory (recursively, by pattern) or glob to files."""
+    if os.path.isfile(path):
+        return [path]
+    if os.path.isdir(path):
+        files = set()
+        for pattern in patterns.split(","):
+            files.update(
+                str(p) for p in Path(path).rglob(pattern.strip()) if p.is_file()
+            )
+        return sorted(files)
+    return sorted(p for p in glob.glob(path, recursive=True) if os.path.isfile(p))
 
 
 class KnowledgeService:
 
-    def __init__(self, config):
+    def __init__(self, config, metrics: Optional[Metrics] = None):
         self.config = config
+        self.metrics = metrics or Metrics()
         self.embeddings = None
         self.vector_store = None
-        self._initialize_embeddings()
-        self._initialize_pinecone()
+        self.reranker = None
+        self.backend = None
+        self.bm25 = BM25Index()
+        self._kb_version = None
+        # Each query runs up to two retrievers (vector, BM25) side by side
+        retriever_workers = config.get("retriever_workers") or 2 * config.get(
+            "answer_concurrency", 16
+        )
+        self._retriever_pool = ThreadPoolExecutor(
+            max_workers=retriever_workers, thread_name_prefix="retriever"
+        )
+        self.index_name = config.get("pinecone_index", "ngo-knowledge-base")
+        self.manifest = None
+
+    def warmup_steps(self) -> List[Tuple[str, Callable[[], None]]]:
+        """Slow initialization steps, in the order they must run."""
+        return [
+            ("embedding model", self._initialize_embeddings),
+            ("vector index", self._initialize_vector_store),
+            ("keyword index", self._load_bm25),
+            ("re-ranker", self._initialize_reranker),
+        ]
+
+    def initialize(self):
+        """Run every initialization step synchronously."""
+        for _, step in self.warmup_steps():
+            step()
 
     def _initialize_embeddings(self):
-        """Initialize HuggingFace embeddings."""
+        """Initialize the configured embeddings backend (PyTorch or ONNX)."""
+        if self.config.get("embedding_backend", "torch") == "onnx":
+            try:
+                embeddings = self._load_onnx_embeddings()
+                self.embeddings = self._wrap_with_cache(
+                    embeddings,
+                    f"{EMBEDDING_MODEL}:onnx:{os.path.basename(embeddings.model_file)}",
+                )
+                return
+            except Exception as e:
+                console.print(
+                    f"[yellow]⚠️  ONNX embeddings unavailable ({e}), "
+                    f"using PyTorch[/yellow]"
+                )
+
+        HuggingFaceEmbeddings = _load_huggingface_embeddings()
         if HuggingFaceEmbeddings is None:
             console.print("[yellow]⚠️  HuggingFace embeddings not available[/yellow]")
             return
 
         try:
-            self.embeddings = HuggingFaceEmbeddings(
-                model_name="sentence-transformers/all-MiniLM-L6-v2"
-            )
+            embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
+            self.embeddings = self._wrap_with_cache(embeddings, EMBEDDING_MODEL)
         except Exception as e:
             console.print(f"[yellow]⚠️  Embeddings initialization failed: {e}[/yellow]")
 
+    def _load_onnx_embeddings(self):
+        """Load the exported ONNX model named in the config."""
+        from .onnx_embeddings import (
+            DEFAULT_ONNX_FILE,
+            OnnxEmbeddings,
+            resolve_model_files,
+        )
+
+        model_file, tokenizer_file = resolve_model_files(
+            EMBEDDING_MODEL,
+            self.config.get("onnx_model_path") or None,
+            self.config.get("onnx_model_file") or DEFAULT_ONNX_FILE,
+        )
+        return OnnxEmbeddings(
+            model_file,
+            tokenizer_file,
+            threads=self.config.get("onnx_threads", 0),
+        )
+
+    def _initialize_reranker(self):
+        """Load the optional cross-encoder re-ranking model."""
+        model_name = self.config.get("reranker_model")
+        if not model_name:
+            return
+
+        try:
+            from .reranker import CrossEncoderReranker
+
+            self.reranker = CrossEncoderReranker(
+                model_name,
+                cache_size=self.config.get("reranker_cache_size", 4096),
+            )
+        except Exception as e:
+            console.print(f"[yellow]⚠️  Re-ranker disabled: {e}[/yellow]")
+
+    def _wrap_with_cache(self, embeddings, model_name: str):
+        """Put the persistent embedding cache in front of the model."""
+        cache_dir = self.config.get("embedding_cache_dir")
+        if not cache_dir:
+            return embeddings
+
+        try:
+            from .embedding_cache import CachedEmbeddings
+
+            return CachedEmbeddings(
+                embeddings,
+                model_name=model_name,
+                cache_dir=cache_dir,
+                max_entries=self.config.get("embedding_cache_size", 100_000),
+                dtype=self.config.get("embedding_cache_dtype", "float16"),
+            )
+        except Exception as e:
+            console.print(f"[yellow]⚠️  Embedding cache disabled: {e}[/yellow]")
+            return embeddings
+
+    def _initialize_vector_store(self):
+        """Pick the configured vector backend, falling back to local search."""
+        backend = self.config.get("vector_backend", "auto")
+
+        use_pinecone = backend == "pinecone" or (
+            backend == "auto" and self.config.get("pinecone_api_key")
+        )
+        if use_pinecone:
+            self._initialize_pinecone()
+        if not self.vector_store and backend != "pinecone":
+            self._initialize_local_store()
+
+        self.manifest = KnowledgeManifest(
+            self.config.get(
+                "knowledge_manifest", "data/.cache/knowledge_manifest.json"
+            ),
+            f"{self.backend}:{self.index_name}",
+        )
+        self._kb_version = None
+
     def _initialize_pinecone(self):
         """Initialize Pinecone vector database."""
         api_key = self.config.get("pinecone_api_key")
+        PineconeVectorStore, Pinecone = _load_pinecone()
 
         if not api_key or not self.embeddings or not Pinecone:
             console.print("[yellow]⚠️  Vector database disabled[/yellow]")
@@ -60,52 +236,534 @@ class KnowledgeService:
 
         try:
             pc = Pinecone(api_key=api_key)
-            index = pc.Index("ngo-knowledge-base")
+            index = pc.Index(
+                self.index_name,
+                pool_threads=max(1, self.config.get("upsert_workers", 4)),
+            )
 
             self.vector_store = PineconeVectorStore(
                 index=index, embedding=self.embeddings
             )
+            self.backend = "pinecone"
             console.print("[green]✅ Connected to vector database[/green]")
 
         except Exception as e:
             console.print(f"[red]❌ Vector database connection failed: {e}[/red]")
 
-    def load_from_file(self, file_path: str) -> bool:
-        """Load knowledge from file."""
-        if not os.path.exists(file_path):
-            return False
+    def _initialize_local_store(self):
+        """Initialize the on-disk local vector index."""
+        if not self.embeddings:
+            console.print("[yellow]⚠️  Local vector index disabled[/yellow]")
+            return
 
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            from .local_store import LocalVectorStore
 
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=1000, chunk_overlap=200, length_function=len
+            self.vector_store = LocalVectorStore(
+                self.embeddings,
+                path=self.config.get("local_index_dir", "data/.cache/local_index"),
+                mode=self.config.get("local_index_mode", "exact"),
+                nprobe=self.config.get("local_index_nprobe", 8),
             )
+            self.backend = "local"
+            console.print(
+                f"[green]✅ Local vector index ready "
+                f"({self.vector_store.count()} chunks)[/green]"
+            )
+        except Exception as e:
+            console.print(f"[red]❌ Local vector index failed: {e}[/red]")
 
-            chunks = text_splitter.split_text(content)
-            documents = [Document(page_content=chunk) for chunk in chunks]
+    def load_from_file(self, file_path: str, reindex: bool = False) -> bool:
+        """Load knowledge from file, upserting only chunks not yet indexed.
 
-            if self.vector_store:
-                self.vector_store.add_documents(documents)
-                console.print(
-                    f"[green]✅ Loaded {len(documents)} knowledge chunks[/green]"
-                )
+        The file is streamed: chunks are embedded batch by batch as they are
+        read, so memory does not grow with the file size.
+        """
+        if not os.path.exists(file_path):
+            return False
 
+        try:
+            self._stream_source(file_path, reindex)
             return True
 
         except Exception as e:
             console.print(f"[red]❌ Error loading knowledge: {e}[/red]")
             return False
 
-    def search(self, query: str, k: int = 3) -> List[str]:
-        """Search knowledge base for relevant information."""
+    def load_path(
+        self, path: str, reindex: bool = False, show_progress: bool = True
+    ) -> bool:
+        """Load a file, a directory tree or a glob of knowledge files.
+
+        Files are chunked in a process pool, then new chunks are embedded
+        and upserted in fixed-size batches on concurrent threads.
+        """
+        files = _resolve_knowledge_files(
+            path, self.config.get("ingest_patterns", "*.md,*.txt")
+        )
+        if not files:
+            return False
+
+        started = time.perf_counter()
+        try:
+            with Progress(console=console, disable=not show_progress) as progress:
+                if os.path.isfile(path):
+                    total, new_count = self._stream_source(path, reindex, progress)
+                else:
+                    sources = self._chunk_files(files, progress)
+                    if os.path.isdir(path):
+                        for source in self._sources_under(path) - set(sources):
+                            sources[source] = {}
+                    total = sum(len(chunks) for chunks in sources.values())
+                    new_count = self._index_sources(sources, reindex, progress)
+        except Exception as e:
+            console.print(f"[red]❌ Error loading knowledge: {e}[/red]")
+            return False
+
+        elapsed = time.perf_counter() - started
+        console.print(
+            f"[green]✅ Ingested {len(files)} files, {total} chunks "
+            f"({new_count} embedded) in {elapsed:.1f}s "
+            f"({total / elapsed if elapsed else 0:.0f} chunks/s)[/green]"
+        )
+        return True
+
+    def _sources_under(self, directory: str) -> set:
+        """Previously indexed sources inside a directory (to drop deleted files)."""
+        prefix = os.path.join(os.path.abspath(directory), "")
+        known = self.bm25.sources()
+        if self.manifest:
+            known |= set(self.manifest.sources)
+        return {source for source in known if source.startswith(prefix)}
+
+    def _chunk_files(self, files: List[str], progress: Progress) -> Dict[str, Dict]:
+        """Chunk files in parallel worker processes (inline for a single file)."""
+        task = progress.add_task("Chunking", total=len(files))
+        workers = min(len(files), self.config.get("ingest_workers") or os.cpu_count())
+        chunk_file = partial(_chunk_file, buffer_size=self._buffer_size)
+        if workers <= 1:
+            sources = {}
+            for file_path in files:
+                source, chunks = chunk_file(file_path)
+                sources[source] = chunks
+                progress.advance(task)
+            return sources
+
+        sources = {}
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            for source, chunks in pool.map(chunk_file, files, chunksize=4):
+                sources[source] = chunks
+                progress.advance(task)
+        return sources
+
+    @property
+    def _buffer_size(self) -> int:
+        """Characters the streaming chunker reads per step."""
+        return self.config.get("chunk_buffer_size") or DEFAULT_BUFFER_SIZE
+
+    def _stream_source(
+        self, file_path: str, reindex: bool, progress: Optional[Progress] = None
+    ) -> Tuple[int, int]:
+        """Chunk, embed and upsert one file as a stream; returns (total, new).
+
+        Only chunk IDs and the text kept for BM25 accumulate; new chunks
+        flow from the reader to the embedding batches through a generator.
+        """
+        source = os.path.abspath(file_path)
+        chunks: Dict[str, str] = {}
+        indexed = set() if reindex or not self.manifest else self.manifest.indexed_ids()
+
+        def new_chunks():
+            for text in iter_chunks(file_path, buffer_size=self._buffer_size):
+                cid = chunk_id(text)
+                if cid in chunks:
+                    continue
+                chunks[cid] = text
+                if cid not in indexed:
+                    yield cid, text, source
+
         if not self.vector_store:
-            return []
+            for _ in new_chunks():
+                pass
+            self._index_sources({source: chunks}, reindex)
+            return len(chunks), 0
+
+        new_count = self._upsert_batches(new_chunks(), progress)
+        self._set_bm25_sources({source: chunks})
+
+        _, removed_ids = self.manifest.diff(source, chunks.keys())
+        self.manifest.update(source, chunks.keys())
+        if removed_ids:
+            self.vector_store.delete(ids=sorted(removed_ids))
+        self.manifest.save()
+
+        console.print(
+            f"[green]✅ Knowledge synced: {len(chunks)} chunks "
+            f"({new_count} new, {len(removed_ids)} removed)[/green]"
+        )
+        return len(chunks), new_count
+
+    def _index_sources(
+        self,
+        sources: Dict[str, Dict[str, str]],
+        reindex: bool,
+        progress: Optional[Progress] = None,
+    ) -> int:
+        """Register chunks for BM25 and sync them to the vector store."""
+        self._set_bm25_sources(sources)
+        if not self.vector_store:
+            return 0
+        return self._sync_chunks(sources, reindex, progress)
+
+    def _set_bm25_sources(self, sources: Dict[str, Dict[str, str]]):
+        """Index sources for BM25 and persist the keyword corpus."""
+        for source, chunks in sources.items():
+            self.bm25.set_source(source, chunks)
+        self._kb_version = None
+        self._save_bm25()
+
+    @property
+    def _bm25_path(self) -> str:
+        """File holding the BM25 corpus between runs."""
+        return self.config.get("bm25_index", "data/.cache/bm25_index.json")
+
+    def _load_bm25(self):
+        """Restore the BM25 corpus saved by earlier ingests of this index.
+
+        Without it, a fresh process would only have keyword search (and
+        BM25 source filters) for files it loaded itself.
+        """
+        path = self._bm25_path
+        if not path or not os.path.exists(path):
+            return
 
         try:
-            docs = self.vector_store.similarity_search(query, k=k)
-            return [doc.page_content for doc in docs]
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
         except Exception as e:
-            console.print(f"[red]Knowledge search error: {e}[/red]")
+            console.print(f"[yellow]⚠️  Ignoring unreadable BM25 index: {e}[/yellow]")
+            return
+        if data.get("index") != f"{self.backend}:{self.index_name}":
+            return
+
+        for source, chunks in data.get("sources", {}).items():
+            self.bm25.set_source(source, chunks)
+        self._kb_version = None
+
+    def _save_bm25(self):
+        """Atomically write the BM25 corpus next to the manifest."""
+        path = self._bm25_path
+        if not path:
+            return
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "index": f"{self.backend}:{self.index_name}",
+                    "sources": self.bm25.snapshot(),
+                },
+                f,
+            )
+        os.replace(tmp_path, path)
+
+    def _sync_chunks(
+        self,
+        sources: Dict[str, Dict[str, str]],
+        reindex: bool,
+        progress: Optional[Progress] = None,
+    ) -> int:
+        """Embed and upsert new chunks, delete removed ones, update manifest."""
+        new_chunks: Dict[str, Tuple[str, str]] = {}
+        removed_ids = set()
+        for source, chunks in sources.items():
+            new_ids, removed = self.manifest.diff(source, chunks.keys())
+            if reindex:
+                new_ids = set(chunks)
+            new_chunks.update((cid, (chunks[cid], source)) for cid in new_ids)
+            removed_ids |= removed
+            self.manifest.update(source, chunks.keys())
+        removed_ids -= set(new_chunks)
+
+        if new_chunks:
+            self._upsert_batches(
+                sorted(
+                    (cid, text, source) for cid, (text, source) in new_chunks.items()
+                ),
+                progress,
+                total=len(new_chunks),
+            )
+
+        if removed_ids:
+            self.vector_store.delete(ids=sorted(removed_ids))
+
+        self.manifest.save()
+
+        total = sum(len(chunks) for chunks in sources.values())
+        console.print(
+            f"[green]✅ Knowledge synced: {total} chunks "
+            f"({len(new_chunks)} new, {len(removed_ids)} removed)[/green]"
+        )
+        return len(new_chunks)
+
+    def _upsert_batches(
+        self,
+        chunks: Iterable[Tuple[str, str, str]],
+        progress: Optional[Progress],
+        total: Optional[int] = None,
+    ) -> int:
+        """Embed and upsert (chunk_id, text, source) in fixed-size batches.
+
+        Batches run on worker threads. ``chunks`` may be a generator: it is
+        only drained as batches finish, with at most two per worker in flight.
+        Each vector is tagged with its source file for filtered search.
+        """
+        from langchain.schema import Document
+
+        batch_size = max(1, self.config.get("embed_batch_size", 256))
+        workers = max(1, self.config.get("upsert_workers", 4))
+        task = progress.add_task("Embedding", total=total) if progress else None
+        upserted = 0
+
+        options = {}
+        if self.backend == "pinecone":
+            options = {
+                "batch_size": self.config.get("pinecone_upsert_batch", 100),
+                "embedding_chunk_size": batch_size,
+            }
+
+        def upsert(batch: List[Tuple[str, str, str]]):
+            documents = [
+                Document(
+                    page_content=text, metadata={"chunk_id": cid, "source": source}
+                )
+                for cid, text, source in batch
+            ]
+            self.vector_store.add_documents(
+                documents, ids=[cid for cid, _, _ in batch], **options
+            )
+            return len(batch)
+
+        def collect(finished):
+            nonlocal upserted
+            for future in finished:
+                done = future.result()
+                upserted += done
+                if task is not None:
+                    progress.advance(task, done)
+
+        iterator = iter(chunks)
+        deferred = getattr(self.vector_store, "deferred_save", nullcontext)
+        with deferred(), ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="upsert"
+        ) as pool:
+            in_flight = set()
+            for batch in iter(lambda: list(islice(iterator, batch_size)), []):
+                if len(in_flight) >= workers * 2:
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(finished)
+                in_flight.add(pool.submit(upsert, batch))
+            collect(wait(in_flight).done)
+
+        flush = getattr(self.embeddings, "flush", None)
+        if flush is not None:
+            flush()
+        return upserted
+
+    @property
+    def kb_version(self) -> str:
+        """Fingerprint of the currently loaded knowledge chunks."""
+        if self._kb_version:
+            return self._kb_version
+
+        ids = self.bm25.chunk_ids()
+        if self.manifest:
+            ids |= self.manifest.indexed_ids()
+        digest = hashlib.sha256(f"{self.backend}:{self.index_name}".encode("utf-8"))
+        for cid in sorted(ids):
+            digest.update(cid.encode("utf-8"))
+        self._kb_version = digest.hexdigest()[:16]
+        return self._kb_version
+
+    def search(
+        self, query: str, k: int = 3, filter: Optional[Dict] = None
+    ) -> List[str]:
+        """Search knowledge base for relevant information.
+
+        ``filter`` is a Pinecone-style metadata filter, e.g.
+        ``{"source": "data/faq.md"}`` or ``{"source": {"$in": [...]}}``.
+        """
+        return [
+            doc.page_content for doc in self.search_documents(query, k, filter=filter)
+        ]
+
+    def embed_queries(self, queries: List[str]) -> Optional[List[List[float]]]:
+        """Embed a batch of queries in one model call; None without a model."""
+        if not self.embeddings:
+            return None
+
+        embed = getattr(self.embeddings, "embed_queries", None)
+        return (embed or self.embeddings.embed_documents)(queries)
+
+    def search_documents(
+        self,
+        query: str,
+        k: int = 3,
+        query_vector: Optional[List[float]] = None,
+        filter: Optional[Dict] = None,
+    ) -> List["Document"]:
+        """Hybrid vector + BM25 search fused with reciprocal-rank fusion.
+
+        Pass ``query_vector`` when the query was already embedded (e.g. in
+        a batch) to skip embedding it again. With a re-ranker, the top
+        ``rerank_candidates`` fused results are re-scored and the best k kept.
+        A metadata ``filter`` scopes both retrievers.
+        """
+        with self.metrics.stage("search"):
+            return self._hybrid_search(
+                query, k, query_vector, self._normalize_filter(filter)
+            )
+
+    @staticmethod
+    def _normalize_filter(filter: Optional[Dict]) -> Optional[Dict]:
+        """Resolve ``source`` paths in a filter to the absolute paths indexed."""
+        if not filter or "source" not in filter:
+            return filter or None
+
+        def resolve(value):
+            if isinstance(value, str):
+                return os.path.abspath(value)
+            if isinstance(value, dict):
+                return {op: resolve(operand) for op, operand in value.items()}
+            return [resolve(item) for item in value]
+
+        return {**filter, "source": resolve(filter["source"])}
+
+    def _hybrid_search(
+        self,
+        query: str,
+        k: int,
+        query_vector: Optional[List[float]],
+        filter: Optional[Dict] = None,
+    ) -> List["Document"]:
+        """Run the retrievers in parallel, fuse and optionally re-rank."""
+        candidates = k
+        if self.reranker:
+            candidates = max(k, self.config.get("rerank_candidates", 20))
+        fetch_k = max(candidates * 3, 10)
+        retrievers = []
+        if self.vector_store and self.config.get("hybrid_vector_weight", 1.0) > 0:
+            retrievers.append(
+                (
+                    "vector",
+                    self.config.get("hybrid_vector_weight", 1.0),
+                    lambda q, n: self._vector_search(q, n, query_vector, filter),
+                )
+            )
+        if self.config.get("hybrid_bm25_weight", 1.0) > 0:
+            retrievers.append(
+                (
+                    "bm25",
+                    self.config.get("hybrid_bm25_weight", 1.0),
+                    lambda q, n: self._bm25_search(q, n, filter),
+                )
+            )
+        if not retrievers:
             return []
+
+        timeout = self.config.get("retriever_timeout", 2.0)
+        deadline = time.monotonic() + timeout
+        futures = [
+            (
+                name,
+                weight,
+                self._retriever_pool.submit(
+                    contextvars.copy_context().run, fn, query, fetch_k
+                ),
+            )
+            for name, weight, fn in retrievers
+        ]
+
+        ranked_lists = []
+        for name, weight, future in futures:
+            try:
+                docs = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                ranked_lists.append((weight, docs))
+            except FutureTimeoutError:
+                console.print(f"[yellow]⚠️  {name} retrieval timed out[/yellow]")
+            except Exception as e:
+                console.print(f"[red]Knowledge search error ({name}): {e}[/red]")
+
+        with self.metrics.stage("fusion"):
+            fused = self._reciprocal_rank_fusion(ranked_lists, candidates)
+        if self.reranker and len(fused) > k:
+            try:
+                with self.metrics.stage("rerank"):
+                    return self.reranker.rerank(query, fused, k)
+            except Exception as e:
+                console.print(f"[yellow]⚠️  Re-ranking skipped: {e}[/yellow]")
+        return fused[:k]
+
+    def _vector_search(
+        self,
+        query: str,
+        k: int,
+        query_vector: Optional[List[float]] = None,
+        filter: Optional[Dict] = None,
+    ) -> List["Document"]:
+        """Dense similarity search on the vector store."""
+        if query_vector is None:
+            with self.metrics.stage("embed_query"):
+                query_vector = self.embeddings.embed_query(query)
+        with self.metrics.stage("vector_search"):
+            if filter:
+                return self.vector_store.similarity_search_by_vector(
+                    query_vector, k=k, filter=filter
+                )
+            return self.vector_store.similarity_search_by_vector(query_vector, k=k)
+
+    def _bm25_search(
+        self, query: str, k: int, filter: Optional[Dict] = None
+    ) -> List["Document"]:
+        """Lexical BM25 search over loaded chunks.
+
+        BM25 only knows each chunk's source, so filters on other metadata
+        leave it nothing to return.
+        """
+        from langchain.schema import Document
+
+        sources = None
+        if filter:
+            from .local_store import matches_filter
+
+            sources = set()
+            if set(filter) == {"source"}:
+                sources = {
+                    source
+                    for source in self.bm25.sources()
+                    if matches_filter({"source": source}, filter)
+                }
+
+        with self.metrics.stage("bm25"):
+            results = self.bm25.search(query, k, sources)
+        return [
+            Document(page_content=text, metadata={"chunk_id": cid})
+            for cid, text, _ in results
+        ]
+
+    def _reciprocal_rank_fusion(self, ranked_lists, k: int) -> List["Document"]:
+        """Merge ranked document lists by weighted 1 / (rrf_k + rank)."""
+        rrf_k = self.config.get("rrf_k", 60)
+        scores: Dict[str, float] = {}
+        docs: Dict[str, "Document"] = {}
+
+        for weight, ranked in ranked_lists:
+            for rank, doc in enumerate(ranked, 1):
+                cid = chunk_id(doc.page_content)
+                scores[cid] = scores.get(cid, 0.0) + weight / (rrf_k + rank)
+                docs.setdefault(cid, doc)
+
+        best = sorted(scores, key=scores.get, reverse=True)[:k]
+        return [docs[cid] for cid in best]
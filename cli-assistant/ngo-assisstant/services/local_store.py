@@ -0,0 +1,325 @@
+import json
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from rich.console import Console
+from langchain.schema import Document
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+console = Console()
+
+
+def matches_filter(metadata: Dict, filter: Dict) -> bool:
+    """Evaluate a Pinecone-style metadata filter ($eq, $ne, $in, $nin)."""
+    for key, condition in filter.items():
+        value = metadata.get(key)
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        for op, operand in condition.items():
+            if op == "$eq" and value != operand:
+                return False
+            if op == "$ne" and value == operand:
+                return False
+            if op == "$in" and value not in operand:
+                return False
+            if op == "$nin" and value in operand:
+                return False
+    return True
+
+
+class LocalVectorStore:
+    """In-process vector store over a matrix of normalized embeddings.
+
+    ``mode`` is ``exact`` (brute-force dot product), ``ivf`` (k-means
+    inverted lists, probing ``nprobe`` lists) or ``hnsw`` (requires
+    ``hnswlib``). Approximate modes only kick in above ``ann_min_size``
+    vectors; smaller stores are always searched exactly.
+    """
+
+    def __init__(
+        self,
+        embedding,
+        path: str,
+        mode: str = "exact",
+        nprobe: int = 8,
+        ann_min_size: int = 20_000,
+    ):
+        self.embedding = embedding
+        self.path = Path(path)
+        self.mode = mode
+        self.nprobe = nprobe
+        self.ann_min_size = ann_min_size
+
+        if mode == "hnsw" and hnswlib is None:
+            console.print(
+                "[yellow]⚠️  hnswlib not installed, using exact search[/yellow]"
+            )
+            self.mode = "exact"
+
+        self._lock = threading.RLock()
+        self._ids: List[str] = []
+        self._texts: List[str] = []
+        self._metadatas: List[Dict] = []
+        self._positions: Dict[str, int] = {}
+        self._vectors = np.zeros((0, 0), dtype=np.float32)
+        self._pending: List[np.ndarray] = []
+        self._autosave = True
+        self._ann = None
+        self._load()
+
+    def count(self) -> int:
+        """Number of stored documents."""
+        return len(self._ids)
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """L2-normalize rows so dot product equals cosine similarity."""
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _load(self):
+        """Load vectors and documents saved by a previous session."""
+        vectors_path = self.path / "vectors.npy"
+        docs_path = self.path / "docs.json"
+        if not vectors_path.exists() or not docs_path.exists():
+            return
+
+        try:
+            with open(docs_path, "r", encoding="utf-8") as f:
+                docs = json.load(f)
+            vectors = np.load(vectors_path)
+
+            self._ids = docs["ids"]
+            self._texts = docs["texts"]
+            self._metadatas = docs["metadatas"]
+            self._vectors = vectors.astype(np.float32, copy=False)
+            self._positions = {doc_id: i for i, doc_id in enumerate(self._ids)}
+        except Exception as e:
+            console.print(
+                f"[yellow]⚠️  Local index unreadable, starting empty: {e}[/yellow]"
+            )
+
+    @contextmanager
+    def deferred_save(self):
+        """Batch many upserts into a single save at the end."""
+        with self._lock:
+            self._autosave = False
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._autosave = True
+                self.save()
+
+    def _consolidate(self):
+        """Fold vectors appended since the last search into the matrix."""
+        if not self._pending:
+            return
+        blocks = (
+            self._pending
+            if self._vectors.size == 0
+            else [self._vectors] + self._pending
+        )
+        self._vectors = np.vstack(blocks)
+        self._pending = []
+
+    def save(self):
+        """Persist vectors and documents to disk."""
+        with self._lock:
+            self._consolidate()
+            self.path.mkdir(parents=True, exist_ok=True)
+            np.save(self.path / "vectors.tmp.npy", self._vectors)
+            docs_tmp = self.path / "docs.json.tmp"
+            with open(docs_tmp, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "ids": self._ids,
+                        "texts": self._texts,
+                        "metadatas": self._metadatas,
+                    },
+                    f,
+                )
+            os.replace(self.path / "vectors.tmp.npy", self.path / "vectors.npy")
+            os.replace(docs_tmp, self.path / "docs.json")
+
+    def add_documents(
+        self, documents: List[Document], ids: Optional[List[str]] = None
+    ) -> List[str]:
+        """Embed and upsert documents, replacing any with the same ID."""
+        if not documents:
+            return []
+
+        ids = ids or [uuid.uuid4().hex for _ in documents]
+        texts = [doc.page_content for doc in documents]
+        vectors = self._normalize(
+            np.asarray(self.embedding.embed_documents(texts), dtype=np.float32)
+        )
+
+        with self._lock:
+            self._remove(ids)
+            self._pending.append(vectors)
+
+            for doc_id, doc in zip(ids, documents):
+                self._positions[doc_id] = len(self._ids)
+                self._ids.append(doc_id)
+                self._texts.append(doc.page_content)
+                self._metadatas.append(dict(doc.metadata or {}))
+
+            self._ann = None
+            if self._autosave:
+                self.save()
+
+        return list(ids)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs) -> None:
+        """Delete documents by ID."""
+        with self._lock:
+            if self._remove(ids or []):
+                self._ann = None
+                if self._autosave:
+                    self.save()
+
+    def _remove(self, ids: List[str]) -> bool:
+        """Drop rows for the given IDs; returns whether anything changed."""
+        drop = {self._positions[i] for i in ids if i in self._positions}
+        if not drop:
+            return False
+
+        self._consolidate()
+        keep = [i for i in range(len(self._ids)) if i not in drop]
+        self._vectors = self._vectors[keep]
+        self._ids = [self._ids[i] for i in keep]
+        self._texts = [self._texts[i] for i in keep]
+        self._metadatas = [self._metadatas[i] for i in keep]
+        self._positions = {doc_id: i for i, doc_id in enumerate(self._ids)}
+        return True
+
+    def similarity_search(
+        self, query: str, k: int = 4, filter: Optional[Dict] = None, **kwargs
+    ) -> List[Document]:
+        """Return the k documents most similar to the query."""
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, filter)]
+
+    def similarity_search_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[Dict] = None,
+        **kwargs,
+    ) -> List[Document]:
+        """Return the k documents most similar to a precomputed query vector."""
+        return [doc for doc, _ in self._search_by_vector(embedding, k, filter)]
+
+    def similarity_search_with_score(
+        self, query: str, k: int = 4, filter: Optional[Dict] = None, **kwargs
+    ) -> List[Tuple[Document, float]]:
+        """Return (document, cosine similarity) pairs, best first."""
+        return self._search_by_vector(self.embedding.embed_query(query), k, filter)
+
+    def _search_by_vector(
+        self, embedding: List[float], k: int, filter: Optional[Dict] = None
+    ) -> List[Tuple[Document, float]]:
+        """Shared search path for text and vector queries.
+
+        A metadata ``filter`` restricts the search to matching rows, which
+        are then scanned exactly.
+        """
+        query_vector = self._normalize(np.asarray([embedding], dtype=np.float32))[0]
+
+        with self._lock:
+            if not self._ids:
+                return []
+            self._consolidate()
+            if filter:
+                rows = np.array(
+                    [
+                        i
+                        for i, metadata in enumerate(self._metadatas)
+                        if matches_filter(metadata, filter)
+                    ],
+                    dtype=np.int64,
+                )
+                if not len(rows):
+                    return []
+                scores = self._vectors[rows] @ query_vector
+                top = np.argsort(-scores)[:k]
+                rows, scores = rows[top], scores[top]
+            else:
+                rows, scores = self._search(query_vector, min(k, len(self._ids)))
+            return [
+                (
+                    Document(
+                        page_content=self._texts[row],
+                        metadata={**self._metadatas[row], "id": self._ids[row]},
+                    ),
+                    float(score),
+                )
+                for row, score in zip(rows, scores)
+            ]
+
+    def _search(self, query_vector: np.ndarray, k: int):
+        """Top-k row indices and scores using the configured mode."""
+        if self.mode != "exact" and len(self._ids) >= self.ann_min_size:
+            if self._ann is None:
+                self._ann = self._build_ann()
+            if self.mode == "hnsw":
+                labels, distances = self._ann.knn_query(query_vector, k=k)
+                return labels[0], 1.0 - distances[0]
+            candidates = self._ivf_candidates(query_vector)
+            if len(candidates) < k:
+                candidates = None
+        else:
+            candidates = None
+
+        vectors = self._vectors if candidates is None else self._vectors[candidates]
+        scores = vectors @ query_vector
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        rows = top if candidates is None else candidates[top]
+        return rows, scores[top]
+
+    def _build_ann(self):
+        """Build the approximate index for the current vectors."""
+        if self.mode == "hnsw":
+            index = hnswlib.Index(space="ip", dim=self._vectors.shape[1])
+            index.init_index(max_elements=len(self._ids), ef_construction=200, M=16)
+            index.add_items(self._vectors, np.arange(len(self._ids)))
+            index.set_ef(max(64, self.nprobe * 8))
+            return index
+        return self._build_ivf()
+
+    def _build_ivf(self, iterations: int = 10):
+        """Cluster vectors with spherical k-means into sqrt(n) inverted lists."""
+        n = len(self._ids)
+        nlist = max(1, int(np.sqrt(n)))
+        rng = np.random.default_rng(0)
+        centroids = self._vectors[rng.choice(n, nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            assign = np.argmax(self._vectors @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = self._vectors[assign == c]
+                if len(members):
+                    centroids[c] = members.mean(axis=0)
+            centroids = self._normalize(centroids)
+
+        assign = np.argmax(self._vectors @ centroids.T, axis=1)
+        lists = [np.flatnonzero(assign == c) for c in range(nlist)]
+        return centroids, lists
+
+    def _ivf_candidates(self, query_vector: np.ndarray) -> np.ndarray:
+        """Rows in the inverted lists closest to the query."""
+        centroids, lists = self._ann
+        nprobe = min(self.nprobe, len(lists))
+        probe = np.argpartition(-(centroids @ query_vector), nprobe - 1)[:nprobe]
+        return np.concatenate([lists[c] for c in probe])
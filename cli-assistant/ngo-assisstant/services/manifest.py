@@ -0,0 +1,68 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Set
+from rich.console import Console
+
+console = Console()
+
+
+def chunk_id(text: str) -> str:
+    """Stable vector ID for a chunk, derived from its content."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+class KnowledgeManifest:
+    """Local record of which chunk IDs are already indexed, per source file."""
+
+    def __init__(self, path: str, index_name: str):
+        self.path = Path(path)
+        self.index_name = index_name
+        self.sources: Dict[str, List[str]] = {}
+        self._load()
+
+    def _load(self):
+        """Load manifest from disk, ignoring manifests for other indexes."""
+        if not self.path.exists():
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("index") == self.index_name:
+                self.sources = data.get("sources", {})
+        except Exception as e:
+            console.print(f"[yellow]⚠️  Ignoring unreadable manifest: {e}[/yellow]")
+
+    def save(self):
+        """Atomically write manifest to disk."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"index": self.index_name, "sources": self.sources}, f)
+        os.replace(tmp_path, self.path)
+
+    def indexed_ids(self) -> Set[str]:
+        """All chunk IDs currently recorded across sources."""
+        return {cid for ids in self.sources.values() for cid in ids}
+
+    def diff(self, source: str, ids: Iterable[str]):
+        """Return (new_ids, removed_ids) for a source against the index."""
+        current = set(ids)
+        previous = set(self.sources.get(source, []))
+        others = {
+            cid for name, cids in self.sources.items() if name != source for cid in cids
+        }
+
+        new_ids = current - previous - others
+        removed_ids = previous - current - others
+        return new_ids, removed_ids
+
+    def update(self, source: str, ids: Iterable[str]):
+        """Record the chunk IDs now indexed for a source."""
+        self.sources[source] = sorted(set(ids))
+
+    def clear(self):
+        """Forget everything, forcing a full re-index."""
+        self.sources = {}
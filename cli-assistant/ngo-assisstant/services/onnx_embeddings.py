@@ -0,0 +1,135 @@
+import os
+from typing import List, Optional, Tuple
+import numpy as np
+
+DEFAULT_ONNX_FILE = "onnx/model_quint8_avx2.onnx"
+
+
+def _load_onnx_runtime():
+    """Import onnxruntime and the tokenizers library."""
+    try:
+        import onnxruntime
+        from tokenizers import Tokenizer
+    except ImportError:
+        return None, None
+    return onnxruntime, Tokenizer
+
+
+def resolve_model_files(
+    model_name: str,
+    model_path: Optional[str] = None,
+    model_file: str = DEFAULT_ONNX_FILE,
+) -> Tuple[str, str]:
+    """Return (model.onnx, tokenizer.json) paths.
+
+    ``model_path`` is a local .onnx file (with tokenizer.json beside it or
+    one directory up) or a directory containing ``model_file``. Without it
+    both files are fetched from the model's Hugging Face repository, which
+    ships exported and int8-quantized ONNX variants.
+    """
+    if model_path:
+        model = model_path
+        if os.path.isdir(model_path):
+            model = os.path.join(model_path, model_file)
+        folder = os.path.dirname(os.path.abspath(model))
+        for candidate in (folder, os.path.dirname(folder)):
+            tokenizer = os.path.join(candidate, "tokenizer.json")
+            if os.path.exists(tokenizer):
+                return model, tokenizer
+        raise FileNotFoundError(f"tokenizer.json not found next to {model}")
+
+    from huggingface_hub import hf_hub_download
+
+    return (
+        hf_hub_download(model_name, model_file),
+        hf_hub_download(model_name, "tokenizer.json"),
+    )
+
+
+def quantize_model(source: str, target: str) -> str:
+    """Write a dynamically int8-quantized copy of an fp32 ONNX model."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(source, target, weight_type=QuantType.QInt8)
+    return target
+
+
+class OnnxEmbeddings:
+    """Sentence embeddings from an exported ONNX (optionally int8) model.
+
+    Reproduces the sentence-transformers pipeline of all-MiniLM-L6-v2 -
+    tokenize, encode, mean-pool over the attention mask, L2-normalize -
+    with only onnxruntime and tokenizers, no PyTorch. Texts are sorted by
+    length before batching so little compute goes to padding.
+    """
+
+    def __init__(
+        self,
+        model_file: str,
+        tokenizer_file: str,
+        batch_size: int = 64,
+        max_length: int = 256,
+        threads: int = 0,
+    ):
+        onnxruntime, Tokenizer = _load_onnx_runtime()
+        if onnxruntime is None:
+            raise ImportError("onnxruntime and tokenizers are not installed")
+
+        options = onnxruntime.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(
+            model_file, options, providers=["CPUExecutionProvider"]
+        )
+        self.model_file = model_file
+        self.batch_size = batch_size
+
+        self.tokenizer = Tokenizer.from_file(tokenizer_file)
+        self.tokenizer.enable_truncation(max_length)
+        pad_id = self.tokenizer.token_to_id("[PAD]") or 0
+        self.tokenizer.enable_padding(pad_id=pad_id, pad_token="[PAD]")
+
+        self._inputs = {i.name for i in self.session.get_inputs()}
+        outputs = [o.name for o in self.session.get_outputs()]
+        self._output = (
+            "last_hidden_state" if "last_hidden_state" in outputs else outputs[0]
+        )
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Embed one padded batch into normalized vectors."""
+        encodings = self.tokenizer.encode_batch(texts)
+        ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": ids, "attention_mask": mask}
+        if "token_type_ids" in self._inputs:
+            feeds["token_type_ids"] = np.array(
+                [e.type_ids for e in encodings], dtype=np.int64
+            )
+
+        hidden = self.session.run([self._output], feeds)[0]
+        weights = mask[..., None].astype(np.float32)
+        pooled = (hidden * weights).sum(axis=1) / np.clip(
+            weights.sum(axis=1), 1e-9, None
+        )
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return pooled / norms
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts in length-sorted batches, returned in input order."""
+        if not texts:
+            return []
+
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        vectors = np.empty((len(texts), 0), dtype=np.float32)
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start : start + self.batch_size]
+            encoded = self._encode([texts[i] for i in batch])
+            if not vectors.shape[1]:
+                vectors = np.empty((len(texts), encoded.shape[1]), dtype=np.float32)
+            vectors[batch] = encoded
+        return vectors.tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query."""
+        return self._encode([text])[0].tolist()
@@ -0,0 +1,231 @@
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterator, List, Tuple
+from ..utils.recipients import iter_file_lines, iter_recipients
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS recipients (
+    id INTEGER PRIMARY KEY,
+    email TEXT NOT NULL,
+    email_key TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS segment_members (
+    segment TEXT NOT NULL,
+    recipient_id INTEGER NOT NULL,
+    PRIMARY KEY (segment, recipient_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS suppressions (
+    email_key TEXT PRIMARY KEY,
+    reason TEXT NOT NULL,
+    created TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS imports (
+    segment TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+"""
+
+TOKEN_PATTERN = re.compile(r"\s*(\(|\)|\||\+|&|-|[A-Za-z0-9_.]+)")
+OPERATORS = {
+    "|": "UNION",
+    "+": "UNION",
+    "union": "UNION",
+    "&": "INTERSECT",
+    "intersect": "INTERSECT",
+    "-": "EXCEPT",
+    "minus": "EXCEPT",
+    "except": "EXCEPT",
+}
+
+
+class SegmentQueryError(ValueError):
+    """Raised for malformed segment expressions."""
+
+
+class RecipientStore:
+    """SQLite store of recipients, segment membership and suppressions.
+
+    Segment expressions combine segment names with ``|``/``union``,
+    ``&``/``intersect`` and ``-``/``minus``, evaluated left to right with
+    parentheses for grouping, e.g. ``(donors | volunteers) - media``.
+    Suppressed addresses are always excluded from query results.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._db.close()
+
+    def import_files(
+        self, files: Dict[str, str], batch_size: int = 5000
+    ) -> Dict[str, int]:
+        """Import segment files that are new or changed since last import."""
+        imported = {}
+        for segment, path in files.items():
+            stat = os.stat(path)
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT mtime_ns, size FROM imports WHERE segment = ?", (segment,)
+                ).fetchone()
+            if row == (stat.st_mtime_ns, stat.st_size):
+                continue
+            imported[segment] = self._import_segment(segment, path, stat, batch_size)
+        return imported
+
+    def _import_segment(self, segment: str, path: str, stat, batch_size: int) -> int:
+        """Replace a segment's members with the addresses in a file."""
+        total = 0
+        addresses = iter_recipients(iter_file_lines(path))
+
+        with self._lock, self._db:
+            self._db.execute(
+                "DELETE FROM segment_members WHERE segment = ?", (segment,)
+            )
+            while True:
+                batch = [
+                    (email, email.casefold()) for email in islice(addresses, batch_size)
+                ]
+                if not batch:
+                    break
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO recipients (email, email_key) VALUES (?, ?)",
+                    batch,
+                )
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO segment_members (segment, recipient_id) "
+                    "SELECT ?, id FROM recipients WHERE email_key = ?",
+                    [(segment, key) for _, key in batch],
+                )
+                total += len(batch)
+            self._db.execute(
+                "INSERT OR REPLACE INTO imports (segment, path, mtime_ns, size) "
+                "VALUES (?, ?, ?, ?)",
+                (segment, path, stat.st_mtime_ns, stat.st_size),
+            )
+        return total
+
+    def segments(self) -> Dict[str, int]:
+        """Segment names with member counts."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT segment, COUNT(*) FROM segment_members GROUP BY segment "
+                "ORDER BY segment"
+            ).fetchall()
+        return dict(rows)
+
+    def suppress(self, email: str, reason: str = "unsubscribe"):
+        """Add an address to the suppression table."""
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO suppressions (email_key, reason, created) "
+                "VALUES (?, ?, ?)",
+                (email.strip().casefold(), reason, datetime.now().isoformat()),
+            )
+
+    def is_suppressed(self, email: str) -> bool:
+        """Primary-key lookup: is this address unsubscribed or bounced?"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT 1 FROM suppressions WHERE email_key = ?",
+                (email.strip().casefold(),),
+            ).fetchone()
+        return row is not None
+
+    def _compile(self, expression: str) -> Tuple[str, List[str]]:
+        """Translate a segment expression into a SQL compound select of IDs."""
+        tokens = self._tokenize(expression)
+        position = 0
+
+        def operand() -> Tuple[str, List[str]]:
+            nonlocal position
+            if position >= len(tokens):
+                raise SegmentQueryError("Expression ended unexpectedly")
+
+            token = tokens[position]
+            position += 1
+            if token == "(":
+                sql, params = compound()
+                if position >= len(tokens) or tokens[position] != ")":
+                    raise SegmentQueryError("Missing closing parenthesis")
+                position += 1
+                return sql, params
+
+            name = token.lower()
+            if name in OPERATORS or token == ")":
+                raise SegmentQueryError(f"Expected a segment name, got '{token}'")
+            return "SELECT recipient_id FROM segment_members WHERE segment = ?", [name]
+
+        def compound() -> Tuple[str, List[str]]:
+            nonlocal position
+            sql, params = operand()
+            while position < len(tokens) and tokens[position].lower() in OPERATORS:
+                operator = OPERATORS[tokens[position].lower()]
+                position += 1
+                right_sql, right_params = operand()
+                sql = f"SELECT * FROM ({sql}) {operator} SELECT * FROM ({right_sql})"
+                params = params + right_params
+            return sql, params
+
+        sql, params = compound()
+        if position != len(tokens):
+            raise SegmentQueryError(f"Unexpected '{tokens[position]}'")
+        return sql, params
+
+    @staticmethod
+    def _tokenize(expression: str) -> List[str]:
+        """Split an expression into names, operators and parentheses."""
+        tokens = []
+        position = 0
+        expression = expression.strip()
+        while position < len(expression):
+            match = TOKEN_PATTERN.match(expression, position)
+            if not match:
+                raise SegmentQueryError(f"Cannot parse '{expression[position:]}'")
+            tokens.append(match.group(1))
+            position = match.end()
+        if not tokens:
+            raise SegmentQueryError("Empty segment expression")
+        return tokens
+
+    def _audience_sql(self, expression: str, select: str) -> Tuple[str, List[str]]:
+        """Wrap a compiled expression with the suppression filter."""
+        ids_sql, params = self._compile(expression)
+        sql = (
+            f"SELECT {select} FROM recipients r WHERE r.id IN ({ids_sql}) "
+            "AND NOT EXISTS (SELECT 1 FROM suppressions s "
+            "WHERE s.email_key = r.email_key)"
+        )
+        return sql, params
+
+    def count(self, expression: str) -> int:
+        """Audience size for a segment expression."""
+        sql, params = self._audience_sql(expression, "COUNT(*)")
+        with self._lock:
+            return self._db.execute(sql, params).fetchone()[0]
+
+    def iter_emails(self, expression: str, batch_size: int = 5000) -> Iterator[str]:
+        """Stream the audience for a segment expression."""
+        sql, params = self._audience_sql(expression, "r.email")
+        with self._lock:
+            cursor = self._db.execute(sql + " ORDER BY r.id", params)
+            rows = cursor.fetchmany(batch_size)
+        while rows:
+            for (email,) in rows:
+                yield email
+            with self._lock:
+                rows = cursor.fetchmany(batch_size)
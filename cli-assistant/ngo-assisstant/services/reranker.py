@@ -0,0 +1,92 @@
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, Tuple
+from .manifest import chunk_id
+
+if TYPE_CHECKING:
+    from langchain.schema import Document
+
+
+def _load_cross_encoder():
+    """Import sentence-transformers' CrossEncoder (pulls in torch)."""
+    try:
+        from sentence_transformers import CrossEncoder
+    except ImportError:
+        return None
+    return CrossEncoder
+
+
+class CrossEncoderReranker:
+    """Re-orders retrieved chunks by a cross-encoder relevance score.
+
+    All uncached (query, chunk) pairs for a query are scored in a single
+    ``predict`` call; scores are kept in an LRU cache keyed by the
+    normalized query and the chunk's content hash.
+    """
+
+    def __init__(self, model_name: str, cache_size: int = 4096, batch_size: int = 32):
+        CrossEncoder = _load_cross_encoder()
+        if CrossEncoder is None:
+            raise ImportError("sentence-transformers is not installed")
+
+        self.model_name = model_name
+        self.model = CrossEncoder(model_name)
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._scores: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+
+    @staticmethod
+    def _query_key(query: str) -> str:
+        """Case- and whitespace-insensitive form of a query."""
+        return " ".join(query.lower().split())
+
+    def rerank(
+        self, query: str, documents: List["Document"], k: int
+    ) -> List["Document"]:
+        """Return the ``k`` documents the cross-encoder scores highest."""
+        if len(documents) <= 1:
+            return documents[:k]
+
+        query_key = self._query_key(query)
+        keys = [(query_key, chunk_id(doc.page_content)) for doc in documents]
+        scores: Dict[Tuple[str, str], float] = {}
+
+        with self._lock:
+            for key in keys:
+                if key in self._scores:
+                    self._scores.move_to_end(key)
+                    scores[key] = self._scores[key]
+            missing = [i for i, key in enumerate(keys) if key not in scores]
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            predicted = self.model.predict(
+                [(query, documents[i].page_content) for i in missing],
+                batch_size=self.batch_size,
+                show_progress_bar=False,
+            )
+            with self._lock:
+                for i, score in zip(missing, predicted):
+                    scores[keys[i]] = float(score)
+                    self._scores[keys[i]] = float(score)
+                while len(self._scores) > self.cache_size:
+                    self._scores.popitem(last=False)
+
+        order = sorted(
+            range(len(documents)), key=lambda i: scores[keys[i]], reverse=True
+        )
+        return [documents[i] for i in order[:k]]
+
+    def stats(self) -> dict:
+        """Hit/miss counters and occupancy of the score cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._scores),
+            "capacity": self.cache_size,
+        }
@@ -0,0 +1,214 @@
+import atexit
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional, Tuple
+import numpy as np
+from rich.console import Console
+
+console = Console()
+
+
+class SemanticResponseCache:
+    """Answer cache keyed by query embedding similarity.
+
+    A stored answer is returned when the nearest cached query has cosine
+    similarity >= ``threshold``, the entry is younger than ``ttl`` seconds,
+    it was produced against the current knowledge-base version and under
+    the same ``context`` (a digest of the conversation history in the
+    prompt, empty for standalone questions).
+
+    Entries are written to disk every ``save_every`` stores and at exit,
+    from a snapshot taken under the lock. Lookups never wait for the
+    JSON dump, and a crash loses at most the last unsaved answers.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        threshold: float = 0.92,
+        ttl: float = 86400,
+        max_entries: int = 500,
+        save_every: int = 32,
+    ):
+        self.path = Path(path)
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.save_every = save_every
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._dirty = 0
+        self._generation = 0
+        self._saved_generation = 0
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._matrix: Optional[np.ndarray] = None
+        self._contexts: Optional[np.ndarray] = None
+        self._keys: List[str] = []
+        self._load()
+        atexit.register(self.flush)
+
+    def _load(self):
+        """Load entries persisted by a previous session."""
+        if not self.path.exists():
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            self._entries = OrderedDict(
+                (self._key(e["query"], e.get("context", "")), e) for e in entries
+            )
+        except Exception as e:
+            console.print(
+                f"[yellow]⚠️  Response cache unreadable, starting empty: {e}[/yellow]"
+            )
+
+    def _snapshot(self) -> Tuple[int, List[dict]]:
+        """(generation, entries in LRU order) to persist; caller holds the lock."""
+        self._dirty = 0
+        self._generation += 1
+        return self._generation, list(self._entries.values())
+
+    def _save(self, snapshot: Tuple[int, List[dict]]):
+        """Persist a snapshot unless a newer one was already written.
+
+        Runs outside the lookup lock.
+        """
+        generation, entries = snapshot
+        with self._save_lock:
+            if generation <= self._saved_generation:
+                return
+            self._saved_generation = generation
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(entries, f)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                console.print(f"[yellow]⚠️  Response cache save failed: {e}[/yellow]")
+
+    def flush(self):
+        """Persist unsaved answers."""
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = self._snapshot()
+        self._save(snapshot)
+
+    @staticmethod
+    def _key(query: str, context: str) -> str:
+        """Entry key: the query text within its conversation context."""
+        return f"{context}\0{query}" if context else query
+
+    @staticmethod
+    def _normalize(vector: List[float]) -> np.ndarray:
+        """Unit-length float32 copy of a vector."""
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+
+    def _ensure_matrix(self):
+        """Rebuild the query matrix after entries changed."""
+        if self._matrix is not None:
+            return
+        self._keys = list(self._entries.keys())
+        if self._keys:
+            self._matrix = np.vstack(
+                [self._entries[key]["vector"] for key in self._keys]
+            ).astype(np.float32)
+        else:
+            self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._contexts = np.array(
+            [self._entries[key].get("context", "") for key in self._keys], dtype=object
+        )
+
+    def _evict_expired(self, kb_version: str):
+        """Drop entries past their TTL or built on an old knowledge base."""
+        now = time.time()
+        stale = [
+            key
+            for key, entry in self._entries.items()
+            if now - entry["created"] > self.ttl or entry["kb_version"] != kb_version
+        ]
+        for key in stale:
+            del self._entries[key]
+        if stale:
+            self._matrix = None
+
+    def lookup(
+        self, vector: List[float], kb_version: str, context: str = ""
+    ) -> Optional[str]:
+        """Return the cached answer for the nearest similar query, if any."""
+        with self._lock:
+            self._evict_expired(kb_version)
+            self._ensure_matrix()
+
+            if not self._keys:
+                self.misses += 1
+                return None
+
+            scores = self._matrix @ self._normalize(vector)
+            scores[self._contexts != context] = -np.inf
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                self.misses += 1
+                return None
+
+            key = self._keys[best]
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]["answer"]
+
+    def store(
+        self,
+        query: str,
+        vector: List[float],
+        answer: str,
+        kb_version: str,
+        context: str = "",
+    ):
+        """Cache an answer, evicting least recently used entries over the cap."""
+        key = self._key(query, context)
+        with self._lock:
+            self._entries[key] = {
+                "query": query,
+                "context": context,
+                "vector": self._normalize(vector).tolist(),
+                "answer": answer,
+                "kb_version": kb_version,
+                "created": time.time(),
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._matrix = None
+            self._dirty += 1
+            snapshot = self._snapshot() if self._dirty >= self.save_every else None
+        if snapshot is not None:
+            self._save(snapshot)
+
+    def clear(self):
+        """Drop every cached answer."""
+        with self._lock:
+            self._entries.clear()
+            self._matrix = None
+            snapshot = self._snapshot()
+        self._save(snapshot)
+
+    def stats(self) -> dict:
+        """Hit/miss counters and occupancy."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self._entries),
+        }
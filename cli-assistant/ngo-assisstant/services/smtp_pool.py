@@ -0,0 +1,139 @@
+import queue
+import smtplib
+import socket
+import threading
+from typing import List, Optional, Union
+
+# Errors after which a session is discarded and the send retried on a new one
+RECONNECT_ERRORS = (smtplib.SMTPServerDisconnected, socket.timeout, ConnectionError)
+
+
+class PooledSMTP:
+    """An authenticated SMTP session plus the number of messages it has sent."""
+
+    def __init__(self, server: smtplib.SMTP):
+        self.server = server
+        self.sent = 0
+
+    def close(self):
+        """Quit politely, ignoring an already-dropped connection."""
+        try:
+            self.server.quit()
+        except Exception:
+            try:
+                self.server.close()
+            except Exception:
+                pass
+
+
+class SMTPConnectionPool:
+    """Reuses authenticated SMTP sessions across many messages.
+
+    At most ``size`` sessions are open at once. A session is recycled after
+    ``max_messages`` sends, and dropped and replaced when the server
+    disconnects, times out or answers 421 (service closing).
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        size: int = 4,
+        max_messages: int = 100,
+        timeout: float = 30,
+        max_retries: int = 2,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.size = size
+        self.max_messages = max_messages
+        self.timeout = timeout
+        self.max_retries = max_retries
+
+        self._idle: "queue.LifoQueue[PooledSMTP]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._closed = False
+
+    def _connect(self) -> PooledSMTP:
+        """Open, secure and authenticate a new session."""
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            server.starttls()
+            server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        return PooledSMTP(server)
+
+    def _acquire(self) -> PooledSMTP:
+        """Take an idle session or open a new one within the size limit."""
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        try:
+            return self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _release(self, session: Optional[PooledSMTP]):
+        """Return a healthy session to the pool, or close a spent one."""
+        try:
+            if session is None:
+                return
+            if self._closed or session.sent >= self.max_messages:
+                session.close()
+            else:
+                self._idle.put(session)
+        finally:
+            self._slots.release()
+
+    @staticmethod
+    def _is_reconnectable(error: Exception) -> bool:
+        """Whether the error means the session is gone but the send may succeed."""
+        if isinstance(error, RECONNECT_ERRORS):
+            return True
+        return (
+            isinstance(error, smtplib.SMTPResponseException) and error.smtp_code == 421
+        )
+
+    def send(self, from_addr: str, to_addrs: List[str], message: Union[str, bytes]):
+        """Send one message, reconnecting and retrying on dropped sessions.
+
+        Byte messages are expected to be 7-bit clean (compiled templates
+        quoted-printable encode their bodies) and are passed through as is.
+        """
+        attempt = 0
+        while True:
+            session = self._acquire()
+            try:
+                session.server.sendmail(from_addr, to_addrs, message)
+                session.sent += 1
+                self._release(session)
+                return
+            except Exception as e:
+                if not self._is_reconnectable(e):
+                    self._release(session)
+                    raise
+
+                session.close()
+                self._release(None)
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+
+    def close(self):
+        """Close every idle session; in-use sessions close when released."""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
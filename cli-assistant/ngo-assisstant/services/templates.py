@@ -0,0 +1,185 @@
+import csv
+import html
+import re
+import uuid
+from email import quoprimime
+from email.header import Header
+from email.utils import formataddr, formatdate, make_msgid
+from typing import Dict, List, Optional, Tuple, Union
+from ..utils.recipients import normalize_email
+
+PLACEHOLDER = re.compile(r"\[([A-Z][A-Z0-9_]*)\]")
+CRLF = "\r\n"
+
+# A compiled body is literal encoded bytes interleaved with (field, html_escape) slots
+Segment = Union[bytes, Tuple[str, bool]]
+
+
+def encode_text(text: str) -> bytes:
+    """Quoted-printable UTF-8 ending in a (soft) line break.
+
+    Ending every encoded run on a line break keeps lines within the
+    76-octet limit however runs are concatenated.
+    """
+    encoded = quoprimime.body_encode(text.encode("utf-8").decode("latin-1"), eol=CRLF)
+    if encoded and not encoded.endswith(CRLF):
+        encoded += "=" + CRLF
+    return encoded.encode("ascii")
+
+
+def parse_column_map(spec: str) -> Dict[str, str]:
+    """Parse 'NAME=first_name,AMOUNT=amount' into {'NAME': 'first_name', ...}."""
+    columns = {}
+    for item in (spec or "").split(","):
+        if "=" not in item:
+            continue
+        field, column = item.split("=", 1)
+        columns[field.strip().upper()] = column.strip()
+    return columns
+
+
+def load_merge_fields(
+    path: str, column_map: Optional[Dict[str, str]] = None, email_column: str = "email"
+) -> Dict[str, Dict[str, str]]:
+    """Per-recipient merge fields from a CSV, keyed by case-folded address.
+
+    Without a column map every other column becomes a field named after
+    its upper-cased header, so a ``name`` column fills ``[NAME]``.
+    """
+    merge_fields = {}
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        columns = column_map or {
+            header.strip().upper(): header
+            for header in reader.fieldnames or []
+            if header != email_column
+        }
+        for row in reader:
+            address = normalize_email(row.get(email_column) or "")
+            if address is None:
+                continue
+            merge_fields[address.casefold()] = {
+                field: (row.get(column) or "").strip()
+                for field, column in columns.items()
+            }
+    return merge_fields
+
+
+class CompiledTemplate:
+    """A subject and body parsed once into a pre-encoded multipart message.
+
+    The plain-text and HTML parts are stored as quoted-printable byte
+    segments with slots for ``[FIELD]`` placeholders, so rendering a
+    message only encodes its headers and merged values. The result is
+    7-bit clean with short lines, whatever the body or the relay.
+    Placeholders with no value or default are left as written.
+    """
+
+    def __init__(
+        self,
+        subject: str,
+        body: str,
+        address: str,
+        from_name: str = "NGO Assistant",
+        defaults: Optional[Dict[str, str]] = None,
+    ):
+        self.defaults = defaults or {}
+        self.fields = sorted(set(PLACEHOLDER.findall(subject + body)))
+        self.boundary = f"=_{uuid.uuid4().hex}"
+        self._sender = formataddr((from_name, address), "utf-8")
+        self._domain = address.rsplit("@", 1)[-1] if "@" in address else None
+        self._subject = PLACEHOLDER.split(subject)
+        self._plain = PLACEHOLDER.split(body.replace("\r\n", "\n"))
+        self._body = self._compile_body()
+        self._static_body = (
+            b"".join(self._body)
+            if all(isinstance(segment, bytes) for segment in self._body)
+            else None
+        )
+
+    def _compile_body(self) -> List[Segment]:
+        """Lay out both MIME parts once, merging adjacent literal bytes."""
+        part_header = (
+            "--{boundary}\r\n"
+            "Content-Type: text/{subtype}; charset=utf-8\r\n"
+            "Content-Transfer-Encoding: quoted-printable\r\n\r\n"
+        )
+        pieces: List[Union[bytes, Tuple[str, bool]]] = [
+            part_header.format(boundary=self.boundary, subtype="plain").encode("ascii")
+        ]
+        for i, piece in enumerate(self._plain):
+            pieces.append(encode_text(piece) if i % 2 == 0 else (piece, False))
+
+        pieces.append(
+            (CRLF + part_header.format(boundary=self.boundary, subtype="html")).encode(
+                "ascii"
+            )
+        )
+        pieces.append(
+            encode_text('<html><body><div style="font-family: Arial, sans-serif;">')
+        )
+        for i, piece in enumerate(self._plain):
+            if i % 2 == 0:
+                pieces.append(encode_text(html.escape(piece).replace("\n", "<br>\n")))
+            else:
+                pieces.append((piece, True))
+        pieces.append(encode_text("</div></body></html>"))
+        pieces.append(f"{CRLF}--{self.boundary}--{CRLF}".encode("ascii"))
+
+        segments: List[Segment] = []
+        for piece in pieces:
+            if (
+                isinstance(piece, bytes)
+                and segments
+                and isinstance(segments[-1], bytes)
+            ):
+                segments[-1] += piece
+            else:
+                segments.append(piece)
+        return segments
+
+    def _value(self, field: str, fields: Dict[str, str]) -> str:
+        """Merged value for a placeholder, falling back to its default."""
+        return fields.get(field) or self.defaults.get(field) or f"[{field}]"
+
+    def _merge(self, parts: List[str], fields: Dict[str, str]) -> str:
+        """Join split text, substituting the field names at odd positions."""
+        return "".join(
+            part if i % 2 == 0 else self._value(part, fields)
+            for i, part in enumerate(parts)
+        )
+
+    def render_text(self, fields: Optional[Dict[str, str]] = None) -> str:
+        """Merged plain-text body, for previews."""
+        return self._merge(self._plain, fields or {})
+
+    def render(self, to_email: str, fields: Optional[Dict[str, str]] = None) -> bytes:
+        """Complete RFC 5322 message for one recipient."""
+        fields = fields or {}
+        subject = Header(self._merge(self._subject, fields), "utf-8").encode(
+            linesep=CRLF
+        )
+        headers = (
+            f"From: {self._sender}\r\n"
+            f"To: {to_email}\r\n"
+            f"Subject: {subject}\r\n"
+            f"Date: {formatdate(localtime=True)}\r\n"
+            f"Message-ID: {make_msgid(domain=self._domain)}\r\n"
+            "MIME-Version: 1.0\r\n"
+            f'Content-Type: multipart/alternative; boundary="{self.boundary}"\r\n'
+            "\r\n"
+        ).encode("utf-8")
+
+        if self._static_body is not None:
+            return headers + self._static_body
+
+        body = []
+        for segment in self._body:
+            if isinstance(segment, bytes):
+                body.append(segment)
+                continue
+            field, escape = segment
+            value = self._value(field, fields)
+            value = html.escape(value).replace("\n", "<br>\n") if escape else value
+            body.append(encode_text(value))
+        return headers + b"".join(body)
@@ -1,7 +1,13 @@
-from typing import List, Dict
+import os
+import time
+from typing import Dict, Optional
 from rich.console import Console
 from rich.table import Table
 from rich.prompt import Confirm, Prompt
+from ..services.campaign_journal import FAILED, SENT, CampaignJournal
+from ..services.recipient_store import RecipientStore, SegmentQueryError
+from ..services.templates import PLACEHOLDER, load_merge_fields, parse_column_map
+from .recipients import RecipientSource
 
 console = Console()
 
@@ -17,23 +23,130 @@ class EmailHandler:
 
         # Get recipients
         recipients = self._get_recipients()
-        if not recipients:
+        if recipients is None or not recipients.count():
+            console.print("[yellow]No valid recipients.[/yellow]")
             return
 
         # Get subject and body
         subject = Prompt.ask("Enter email subject")
         body = self._get_email_body()
+        merge = self._get_merge_settings(subject, body)
 
         # Show preview and confirm
-        self._show_preview(recipients, subject, body)
+        self._show_preview(recipients, subject, body, merge)
+
+        if Confirm.ask(f"Send email to {recipients.count()} recipients?"):
+            journal = CampaignJournal.create(
+                self._campaign_dir(),
+                subject,
+                body,
+                recipients,
+                fsync_every=self._config("journal_fsync_every", 100),
+                merge=merge,
+            )
+            console.print(f"[dim]Campaign {journal.campaign_id}[/dim]")
+            self._run_campaign(journal)
+
+    def resume_campaign(self):
+        """Resume an interrupted campaign, skipping delivered recipients."""
+        campaign_ids = CampaignJournal.list_campaigns(self._campaign_dir())
+        if not campaign_ids:
+            console.print("[yellow]No campaigns to resume.[/yellow]")
+            return
+
+        journals = [
+            CampaignJournal.load(self._campaign_dir(), campaign_id)
+            for campaign_id in campaign_ids[:10]
+        ]
+
+        campaign_table = Table(title="Recent Campaigns")
+        campaign_table.add_column("#", style="cyan")
+        campaign_table.add_column("Campaign", style="white")
+        campaign_table.add_column("Subject", style="white")
+        campaign_table.add_column("Sent / Failed / Untried", style="white")
+        for i, journal in enumerate(journals, 1):
+            summary = journal.summary()
+            campaign_table.add_row(
+                str(i),
+                journal.campaign_id,
+                journal.meta.get("subject", ""),
+                f"{summary['sent']} / {summary['failed']} / {summary['untried']}",
+            )
+        console.print(campaign_table)
 
-        if Confirm.ask(f"Send email to {len(recipients)} recipients?"):
-            results = self.email_service.send_bulk(recipients, subject, body)
-            self._show_results(results, len(recipients))
+        choice = int(
+            Prompt.ask(
+                "Choose campaign", choices=[str(i) for i in range(1, len(journals) + 1)]
+            )
+        )
+        journal = journals[choice - 1]
+        pending = journal.count_pending(self._config("email_max_attempts", 3))
+
+        if not pending:
+            console.print("[green]✅ Nothing left to send for this campaign.[/green]")
+            return
+        if Confirm.ask(f"Resume sending to {pending} recipients?"):
+            self._run_campaign(journal)
+
+    def _run_campaign(self, journal: CampaignJournal):
+        """Send to pending recipients, retrying failures with exponential backoff."""
+        max_attempts = self._config("email_max_attempts", 3)
+        backoff = self._config("email_retry_backoff", 5.0)
+        subject = journal.meta["subject"]
+        body = journal.meta["body"]
+        merge = journal.meta.get("merge") or {}
+        merge_fields = self._load_merge_fields(merge)
+        results = {}
+
+        def record(recipient: str, success: bool):
+            journal.record(recipient, SENT if success else FAILED)
 
-    def _get_recipients(self) -> List[str]:
+        try:
+            for round_number in range(max_attempts):
+                pending = journal.count_pending(max_attempts)
+                if not pending:
+                    break
+
+                if round_number:
+                    delay = backoff * 2 ** (round_number - 1)
+                    console.print(
+                        f"[yellow]🔁 Retrying {pending} failed recipients "
+                        f"in {delay:.0f}s...[/yellow]"
+                    )
+                    time.sleep(delay)
+
+                results = self.email_service.send_bulk(
+                    journal.iter_pending(max_attempts),
+                    subject,
+                    body,
+                    on_result=record,
+                    total=pending,
+                    merge_fields=merge_fields,
+                    defaults=merge.get("defaults"),
+                )
+        finally:
+            journal.close()
+
+        summary = journal.summary()
+        results = dict(results, successful=summary["sent"], failed=summary["failed"])
+        self._show_results(results, summary["total"])
+
+    def _config(self, key: str, default=None):
+        """Read a setting from the email service's config."""
+        return self.email_service.config.get(key, default)
+
+    def _campaign_dir(self) -> str:
+        """Directory holding campaign journals."""
+        return self._config("campaign_dir", "data/.cache/campaigns")
+
+    def _get_recipients(self) -> Optional[RecipientSource]:
         """Get email recipients through user interaction."""
-        email_lists = self.email_service.load_email_lists()
+        store = self.email_service.recipient_store()
+        if store is not None:
+            segments = store.segments()
+        else:
+            email_lists = self.email_service.load_email_lists()
+            segments = {name: source.estimate() for name, source in email_lists.items()}
 
         console.print("\n[cyan]Select recipient source:[/cyan]")
         options = [
@@ -41,10 +154,12 @@ class EmailHandler:
             "Enter multiple emails (comma-separated)",
             "Load from file",
         ]
+        if store is not None:
+            options.append("Query segments (e.g. (donors | volunteers) - media)")
 
         # Add email list options
-        for list_name, emails in email_lists.items():
-            options.append(f"Use {list_name} list ({len(emails)} emails)")
+        for list_name, count in segments.items():
+            options.append(f"Use {list_name} list (~{count} emails)")
 
         for i, option in enumerate(options, 1):
             console.print(f"{i}. {option}")
@@ -57,30 +172,63 @@ class EmailHandler:
 
         if choice == 1:
             email = Prompt.ask("Enter email address")
-            return [email] if email else []
+            return self.email_service.recipient_source("manual", [email])
 
         elif choice == 2:
             emails_input = Prompt.ask("Enter emails (comma-separated)")
-            return [email.strip() for email in emails_input.split(",") if email.strip()]
+            return self.email_service.recipient_source("manual", [emails_input])
 
         elif choice == 3:
             file_path = Prompt.ask("Enter file path")
             return self._load_emails_from_file(file_path)
 
+        elif choice == 4 and store is not None:
+            expression = Prompt.ask("Segment expression")
+            return self._query_segments(store, expression)
+
         else:
             # Email list selection
-            list_index = choice - 4
-            list_name = list(email_lists.keys())[list_index]
+            list_index = choice - (len(options) - len(segments)) - 1
+            list_name = list(segments.keys())[list_index]
+            if store is not None:
+                return self.email_service.segment_source(store, list_name)
             return email_lists[list_name]
 
-    def _load_emails_from_file(self, file_path: str) -> List[str]:
-        """Load emails from specified file."""
+    def _query_segments(
+        self, store: RecipientStore, expression: str
+    ) -> Optional[RecipientSource]:
+        """Resolve a segment expression, reporting syntax errors."""
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                return [line.strip() for line in f if line.strip() and "@" in line]
-        except FileNotFoundError:
+            store.count(expression)
+        except SegmentQueryError as e:
+            console.print(f"[red]❌ Invalid segment expression: {e}[/red]")
+            return None
+        return self.email_service.segment_source(store, expression)
+
+    def unsubscribe(self):
+        """Add an address to the suppression list."""
+        store = self.email_service.recipient_store()
+        if store is None:
+            console.print("[red]❌ Recipient store is not configured[/red]")
+            return
+
+        email = Prompt.ask("Email address to suppress").strip()
+        if not email:
+            return
+        reason = Prompt.ask(
+            "Reason", choices=["unsubscribe", "bounce"], default="unsubscribe"
+        )
+        store.suppress(email, reason)
+        console.print(
+            f"[green]✅ {email} will be excluded from future campaigns[/green]"
+        )
+
+    def _load_emails_from_file(self, file_path: str) -> Optional[RecipientSource]:
+        """Stream emails from specified file."""
+        if not os.path.exists(file_path):
             console.print(f"[red]❌ File {file_path} not found[/red]")
-            return []
+            return None
+        return self.email_service.recipient_source_from_file(file_path, file_path)
 
     def _get_email_body(self) -> str:
         """Get email body from user or template."""
@@ -121,7 +269,56 @@ class EmailHandler:
 
         return "\n".join(lines)
 
-    def _show_preview(self, recipients: List[str], subject: str, body: str):
+    def _get_merge_settings(self, subject: str, body: str) -> Dict:
+        """Ask where to fill the template's [FIELD] placeholders from."""
+        fields = sorted(set(PLACEHOLDER.findall(subject + body)))
+        if not fields:
+            return {}
+
+        console.print(
+            f"\n[cyan]Template fields: {', '.join(f'[{f}]' for f in fields)}[/cyan]"
+        )
+        merge = {"path": "", "columns": {}, "defaults": {}}
+        path = Prompt.ask("Merge fields CSV (blank to skip)", default="").strip()
+        if path and not os.path.exists(path):
+            console.print(f"[red]❌ File {path} not found[/red]")
+            path = ""
+        if path:
+            merge["path"] = path
+            merge["columns"] = parse_column_map(
+                Prompt.ask(
+                    "Column map, e.g. NAME=first_name (blank to match headers)",
+                    default="",
+                )
+            )
+
+        for field in fields:
+            default = Prompt.ask(f"Value for [{field}] when missing", default="")
+            if default:
+                merge["defaults"][field] = default
+        return merge
+
+    def _load_merge_fields(self, merge: Dict) -> Dict[str, Dict[str, str]]:
+        """Read per-recipient fields for a campaign's merge settings."""
+        if not merge.get("path"):
+            return {}
+        try:
+            return load_merge_fields(
+                merge["path"],
+                merge.get("columns"),
+                self._config("merge_email_column", "email"),
+            )
+        except Exception as e:
+            console.print(f"[red]❌ Error loading merge fields: {e}[/red]")
+            return {}
+
+    def _show_preview(
+        self,
+        recipients: RecipientSource,
+        subject: str,
+        body: str,
+        merge: Optional[Dict] = None,
+    ):
         """Show email preview before sending."""
         console.print("\n[yellow]📋 Email Preview[/yellow]")
 
@@ -129,18 +326,33 @@ class EmailHandler:
         preview_table.add_column("Field", style="cyan")
         preview_table.add_column("Content", style="white")
 
-        sample_recipients = ", ".join(recipients[:3])
-        if len(recipients) > 3:
-            sample_recipients += f" ... (+{len(recipients) - 3} more)"
-
-        preview_table.add_row("Recipients", f"{len(recipients)} total")
+        total = recipients.count()
+        stats = recipients.stats
+        samples = recipients.sample(3)
+        sample_recipients = ", ".join(samples)
+        if total > 3:
+            sample_recipients += f" ... (+{total - 3} more)"
+
+        preview_table.add_row("Recipients", f"{total} total")
+        preview_table.add_row(
+            "Skipped",
+            f"{stats.duplicates} duplicates, {stats.invalid} invalid "
+            f"({stats.corrected} typo domains fixed)",
+        )
         preview_table.add_row("Sample", sample_recipients)
         preview_table.add_row("Subject", subject)
+        if merge and samples:
+            template = self.email_service.compile_template(
+                subject, body, defaults=merge.get("defaults")
+            )
+            fields = self._load_merge_fields(merge).get(samples[0].casefold())
+            body = template.render_text(fields)
+            preview_table.add_row("Merged for", samples[0])
         preview_table.add_row("Body", body[:150] + ("..." if len(body) > 150 else ""))
 
         console.print(preview_table)
 
-    def _show_results(self, results: Dict[str, int], total: int):
+    def _show_results(self, results: Dict, total: int):
         """Show email sending results."""
         console.print(f"\n[bold cyan]📊 Email Campaign Results[/bold cyan]")
 
@@ -152,4 +364,17 @@ class EmailHandler:
         results_table.add_row("❌ Failed", str(results["failed"]))
         results_table.add_row("📧 Total", str(total))
 
+        if results.get("throughput"):
+            results_table.add_row(
+                "⚡ Throughput",
+                f"{results['throughput']:.1f} mails/s in {results['elapsed']:.1f}s",
+            )
+        latency = results.get("latency")
+        if latency:
+            results_table.add_row(
+                "⏱  Latency",
+                f"mean {latency['mean_ms']:.0f} ms · p50 {latency['p50_ms']:.0f} ms · "
+                f"p95 {latency['p95_ms']:.0f} ms · max {latency['max_ms']:.0f} ms",
+            )
+
         console.print(results_table)
@@ -0,0 +1,137 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+# The request being traced in the current context, if any
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("ngo_trace", default=None)
+
+
+class Trace:
+    """Stage timings and fields collected for one request."""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self.fields: Dict = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float):
+        """Accumulate time spent in a stage."""
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def record(self) -> Dict:
+        """JSON-serializable form for the trace file."""
+        with self._lock:
+            return {
+                "ts": time.time(),
+                "kind": self.kind,
+                "total_ms": round((time.perf_counter() - self.started) * 1000, 3),
+                "stages": {k: round(v * 1000, 3) for k, v in self.stages.items()},
+                **self.fields,
+            }
+
+
+class Metrics:
+    """In-memory latency histograms and counters for the hot path.
+
+    Stage timings use the monotonic ``perf_counter`` clock and keep the
+    last ``window`` samples per stage for percentiles. When ``trace_path``
+    is set every finished request is also appended there as one JSON line.
+    Stages observed on other threads join the request when the work is run
+    in a copied ``contextvars`` context.
+    """
+
+    def __init__(self, trace_path: Optional[str] = None, window: int = 1000):
+        self.trace_path = trace_path
+        self.window = window
+        self.samples: Dict[str, deque] = {}
+        self.counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._trace_file = None
+
+    @contextmanager
+    def request(self, kind: str) -> Iterator[Trace]:
+        """Trace one request; its total time is recorded as ``kind``."""
+        trace = Trace(kind)
+        token = _current_trace.set(trace)
+        try:
+            yield trace
+        finally:
+            _current_trace.reset(token)
+            self.observe(kind, time.perf_counter() - trace.started, trace=False)
+            self._write(trace)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a block as a stage of the current request."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def observe(self, name: str, seconds: float, trace: bool = True):
+        """Record one stage duration."""
+        with self._lock:
+            if name not in self.samples:
+                self.samples[name] = deque(maxlen=self.window)
+            self.samples[name].append(seconds)
+
+        current = _current_trace.get()
+        if trace and current is not None:
+            current.add(name, seconds)
+
+    def mark(self, **fields):
+        """Attach fields (token counts, cache flags) to the current request.
+
+        Numeric and boolean values are also summed into counters.
+        """
+        with self._lock:
+            for name, value in fields.items():
+                if isinstance(value, (bool, int, float)):
+                    self.counters[name] = self.counters.get(name, 0) + value
+
+        current = _current_trace.get()
+        if current is not None:
+            current.fields.update(fields)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Count and p50/p95/max milliseconds per stage."""
+        with self._lock:
+            snapshot = {name: sorted(values) for name, values in self.samples.items()}
+
+        summary = {}
+        for name, ordered in snapshot.items():
+            if not ordered:
+                continue
+            summary[name] = {
+                "count": len(ordered),
+                "p50_ms": ordered[len(ordered) // 2] * 1000,
+                "p95_ms": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+                * 1000,
+                "max_ms": ordered[-1] * 1000,
+            }
+        return summary
+
+    def _write(self, trace: Trace):
+        """Append a finished request to the JSONL trace file."""
+        if not self.trace_path:
+            return
+
+        line = json.dumps(trace.record(), ensure_ascii=False) + "\n"
+        with self._lock:
+            try:
+                if self._trace_file is None:
+                    os.makedirs(os.path.dirname(self.trace_path) or ".", exist_ok=True)
+                    self._trace_file = open(self.trace_path, "a", encoding="utf-8")
+                self._trace_file.write(line)
+                self._trace_file.flush()
+            except OSError:
+                self.trace_path = None
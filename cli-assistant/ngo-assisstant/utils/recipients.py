@@ -0,0 +1,262 @@
+import difflib
+import hashlib
+import math
+import os
+import re
+from email.utils import parseaddr
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional
+
+EMAIL_PATTERN = re.compile(
+    r"^[A-Za-z0-9.!#$%&'*+/=?^_`{|}~-]+"
+    r"@[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?"
+    r"(?:\.[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?)+$"
+)
+SEPARATORS = re.compile(r"[,;\t]")
+
+COMMON_DOMAINS = [
+    "gmail.com",
+    "yahoo.com",
+    "yahoo.co.in",
+    "hotmail.com",
+    "outlook.com",
+    "live.com",
+    "icloud.com",
+    "rediffmail.com",
+    "protonmail.com",
+]
+DOMAIN_TYPOS = {
+    "egmail.com": "gmail.com",
+    "gmial.com": "gmail.com",
+    "gamil.com": "gmail.com",
+    "gmai.com": "gmail.com",
+    "gnail.com": "gmail.com",
+    "gmail.co": "gmail.com",
+    "gmail.con": "gmail.com",
+    "gmail.cm": "gmail.com",
+    "yaho.com": "yahoo.com",
+    "yahooo.com": "yahoo.com",
+    "yahoo.con": "yahoo.com",
+    "hotmial.com": "hotmail.com",
+    "hotmal.com": "hotmail.com",
+    "hotmail.con": "hotmail.com",
+    "outlok.com": "outlook.com",
+    "outlook.con": "outlook.com",
+    "rediffmail.co": "rediffmail.com",
+}
+
+
+class RecipientStats:
+    """Counters collected while streaming recipients."""
+
+    def __init__(self):
+        self.valid = 0
+        self.invalid = 0
+        self.duplicates = 0
+        self.corrected = 0
+        self.suppressed = 0
+
+
+class BloomFilter:
+    """Fixed-memory set membership with a bounded false-positive rate."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> Iterator[int]:
+        """Bit positions for a key via double hashing."""
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: str) -> bool:
+        """Add a key; returns True if it was (probably) already present."""
+        present = True
+        for position in self._positions(key):
+            byte, bit = divmod(position, 8)
+            if not self._bits[byte] & (1 << bit):
+                present = False
+                self._bits[byte] |= 1 << bit
+        return present
+
+
+def correct_domain(domain: str) -> str:
+    """Fix common typos in well-known mailbox domains."""
+    if domain in DOMAIN_TYPOS:
+        return DOMAIN_TYPOS[domain]
+    if domain in COMMON_DOMAINS:
+        return domain
+
+    tld = domain.rsplit(".", 1)[-1]
+    candidates = [d for d in COMMON_DOMAINS if d.rsplit(".", 1)[-1] == tld]
+    match = difflib.get_close_matches(domain, candidates, n=1, cutoff=0.9)
+    return match[0] if match else domain
+
+
+def normalize_email(raw: str, stats: Optional[RecipientStats] = None) -> Optional[str]:
+    """Validate and normalize one address; None when it is malformed."""
+    address = parseaddr(raw.strip())[1].strip()
+    if not EMAIL_PATTERN.match(address):
+        return None
+
+    local, domain = address.rsplit("@", 1)
+    domain = domain.lower()
+    fixed = correct_domain(domain)
+    if fixed != domain and stats is not None:
+        stats.corrected += 1
+    return f"{local}@{fixed}"
+
+
+def iter_recipients(
+    lines: Iterable[str],
+    dedup: str = "exact",
+    stats: Optional[RecipientStats] = None,
+    bloom_capacity: int = 10_000_000,
+    bloom_error: float = 0.001,
+    suppressed: Optional[Callable[[str], bool]] = None,
+) -> Iterator[str]:
+    """Stream valid, typo-corrected, de-duplicated addresses from raw lines.
+
+    ``dedup`` is ``exact`` (a set of case-folded addresses), ``bloom``
+    (bounded memory; may rarely drop a unique address) or ``none``.
+    Addresses for which ``suppressed(address)`` is true are skipped.
+    """
+    stats = stats if stats is not None else RecipientStats()
+    seen = set() if dedup == "exact" else None
+    bloom = BloomFilter(bloom_capacity, bloom_error) if dedup == "bloom" else None
+
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        for part in SEPARATORS.split(line):
+            if "@" not in part:
+                continue
+
+            address = normalize_email(part, stats)
+            if address is None:
+                stats.invalid += 1
+                continue
+
+            key = address.casefold()
+            if seen is not None:
+                if key in seen:
+                    stats.duplicates += 1
+                    continue
+                seen.add(key)
+            elif bloom is not None and bloom.add(key):
+                stats.duplicates += 1
+                continue
+
+            if suppressed is not None and suppressed(address):
+                stats.suppressed += 1
+                continue
+
+            stats.valid += 1
+            yield address
+
+
+def iter_file_lines(path: str) -> Iterator[str]:
+    """Lazily yield lines of a text file."""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        yield from f
+
+
+def count_lines(path: str, block_size: int = 1 << 20) -> int:
+    """Fast raw line count by scanning bytes, without decoding."""
+    count = 0
+    last = b"\n"
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            count += block.count(b"\n")
+            last = block[-1:]
+    return count + (last != b"\n")
+
+
+class RecipientSource:
+    """A re-iterable stream of clean recipients from a file or in-memory list."""
+
+    def __init__(
+        self,
+        name: str,
+        lines: Callable[[], Iterable[str]],
+        path: Optional[str] = None,
+        dedup: str = "exact",
+        bloom_capacity: int = 10_000_000,
+        suppressed: Optional[Callable[[str], bool]] = None,
+        counter: Optional[Callable[[], int]] = None,
+    ):
+        self.name = name
+        self.path = path
+        self.dedup = dedup
+        self.bloom_capacity = bloom_capacity
+        self.suppressed = suppressed
+        self._counter = counter
+        self.stats = RecipientStats()
+        self._lines = lines
+        self._count_key = None
+
+    @classmethod
+    def from_file(cls, name: str, path: str, **kwargs) -> "RecipientSource":
+        """Recipients streamed from a text/CSV file."""
+        return cls(name, lambda: iter_file_lines(path), path=path, **kwargs)
+
+    @classmethod
+    def from_list(cls, name: str, items: List[str], **kwargs) -> "RecipientSource":
+        """Recipients typed in at the prompt."""
+        return cls(name, lambda: iter(items), **kwargs)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter_recipients(
+            self._lines(),
+            self.dedup,
+            RecipientStats(),
+            self.bloom_capacity,
+            suppressed=self.suppressed,
+        )
+
+    def estimate(self) -> int:
+        """Raw line count; cheap enough for menus of very large files."""
+        if self._counter:
+            return self._counter()
+        if self.path:
+            return count_lines(self.path)
+        return sum(1 for _ in self._lines())
+
+    def count(self) -> int:
+        """Exact count of clean recipients, streamed; cached per file version."""
+        if self._counter:
+            self.stats = RecipientStats()
+            self.stats.valid = self._counter()
+            return self.stats.valid
+
+        key = None
+        if self.path:
+            stat = os.stat(self.path)
+            key = (stat.st_mtime_ns, stat.st_size)
+            if key == self._count_key:
+                return self.stats.valid
+
+        self.stats = RecipientStats()
+        for _ in iter_recipients(
+            self._lines(),
+            self.dedup,
+            self.stats,
+            self.bloom_capacity,
+            suppressed=self.suppressed,
+        ):
+            pass
+        self._count_key = key
+        return self.stats.valid
+
+    def sample(self, n: int = 3) -> List[str]:
+        """First few clean recipients."""
+        return list(islice(iter(self), n))
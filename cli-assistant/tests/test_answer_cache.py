@@ -0,0 +1,93 @@
+import importlib
+import sys
+import threading
+from collections import OrderedDict, deque
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+agent_module = importlib.import_module("ngo-assisstant.core.agent")
+response_cache = importlib.import_module("ngo-assisstant.services.response_cache")
+
+VECTORS = {"Hello": [1.0, 0.0, 0.0], "Hi there": [0.0, 0.0, 1.0]}
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+        self.usage_metadata = None
+
+
+class FakeLLM:
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        return FakeResponse(f"answer {self.calls}")
+
+
+class FakeEmbeddings:
+    def embed_query(self, text):
+        return VECTORS.get(text, [0.0, 1.0, 0.0])
+
+
+class FakeKnowledge:
+    embeddings = FakeEmbeddings()
+    kb_version = "v1"
+
+    def search_documents(self, *args, **kwargs):
+        return []
+
+
+class FakeWarmup:
+    done = True
+
+    def wait(self):
+        pass
+
+
+def make_agent(tmp_path):
+    agent = agent_module.NGOAgent.__new__(agent_module.NGOAgent)
+    agent.config = {}
+    agent.metrics = agent_module.Metrics()
+    agent.knowledge_service = FakeKnowledge()
+    agent.llm = FakeLLM()
+    agent.warmup = FakeWarmup()
+    agent.response_cache = response_cache.SemanticResponseCache(
+        str(tmp_path / "answers.json")
+    )
+    agent.conversation_history = deque()
+    agent.sessions = OrderedDict()
+    agent._sessions_lock = threading.Lock()
+    agent.context_builder = agent_module.ContextBuilder()
+    return agent
+
+
+def ask(agent, question, session):
+    answer = agent.generate_response(question, session)
+    agent.record_turn(question, answer, session)
+    return answer
+
+
+def test_second_turn_hits_cache_after_same_history(tmp_path):
+    agent = make_agent(tmp_path)
+
+    first = ask(agent, "Hello", "s1")
+    follow_up = ask(agent, "Tell me more", "s1")
+    assert agent.llm.calls == 2
+
+    assert ask(agent, "Hello", "s2") == first
+    assert ask(agent, "Tell me more", "s2") == follow_up
+    assert agent.llm.calls == 2
+
+
+def test_second_turn_misses_cache_after_different_history(tmp_path):
+    agent = make_agent(tmp_path)
+
+    ask(agent, "Hello", "s1")
+    follow_up = ask(agent, "Tell me more", "s1")
+
+    ask(agent, "Hi there", "s2")
+    assert ask(agent, "Tell me more", "s2") != follow_up
+    assert agent.llm.calls == 4
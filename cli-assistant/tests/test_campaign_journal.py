@@ -0,0 +1,31 @@
+import importlib
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+campaign_journal = importlib.import_module("ngo-assisstant.services.campaign_journal")
+CampaignJournal = campaign_journal.CampaignJournal
+
+
+def test_create_record_summary_resume(tmp_path):
+    recipients = ["a@example.org", "b@example.org", "c@example.org"]
+    merge = {"fields": "donors.csv", "defaults": {"name": "Friend"}}
+    journal = CampaignJournal.create(
+        str(tmp_path), "Subject", "Hello {name}", recipients, merge=merge
+    )
+    journal.record("a@example.org", campaign_journal.SENT)
+    journal.record("b@example.org", campaign_journal.FAILED)
+    journal.close()
+
+    assert journal.summary() == {"total": 3, "sent": 1, "failed": 1, "untried": 1}
+
+    assert CampaignJournal.list_campaigns(str(tmp_path)) == [journal.campaign_id]
+    resumed = CampaignJournal.load(str(tmp_path), journal.campaign_id)
+    assert resumed.summary() == journal.summary()
+    assert resumed.meta["merge"] == merge
+    assert list(resumed.iter_pending(max_attempts=3)) == [
+        "b@example.org",
+        "c@example.org",
+    ]
+    assert list(resumed.iter_pending(max_attempts=1)) == ["c@example.org"]